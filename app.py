@@ -1,8 +1,5 @@
 # -*- coding: utf-8 -*-
 import streamlit as st
-import importlib
-import sys
-import streamlit.components.v1 as components
 
 
 from funcoes_compartilhadas.estilos import (
@@ -11,59 +8,25 @@ from funcoes_compartilhadas.estilos import (
 )
 
 from funcoes_compartilhadas.controle_acesso import (
-    login, usuario_logado, menus_liberados, logoutX
+    login, recuperar_senha, usuario_logado, acesso_usuario, logoutX
 )
-from funcoes_compartilhadas import conversa_banco
+from funcoes_compartilhadas import ativos, barramento, compactacao, migracoes, navegacao, registro_paginas
 
 
-# VAI SERVIR PARA PODER RECARREGAR A PAGINA AUXILIAR DE RECUPERAÇÃO DE SENHA
-from urllib.parse import parse_qs
-def reload_module(path: str):
-    if path in sys.modules:
-        return importlib.reload(sys.modules[path])
-    return importlib.import_module(path)
+# Config inicial
+st.set_page_config(page_title="app_centrovisao.", page_icon="👁️", layout="wide")
+aplicar_estilo_padrao()  # CSS + idioma: uma vez por sessão
+
+# PAGINA AUXILIAR DE RECUPERAÇÃO DE SENHA (sem login)
 query_params = st.query_params.to_dict()
 if query_params.get("recuperar") == "1":
-    mod = reload_module("paginas.redefinir_senha")
-    mod.app()
+    if registro_paginas.existe("redefinir_senha"):
+        registro_paginas.carregar("redefinir_senha").app()
+    else:
+        recuperar_senha()  # e-mail pela fila, sem bloquear o script
     st.stop()
 
 
-# Config inicial
-st.set_page_config(page_title="app_centrovisao.", page_icon="👁️", layout="wide")
-aplicar_estilo_padrao()
-
-# CSS ajuste alinhamento do menu
-st.markdown("""
-    <style>
-    [data-testid="stSidebar"] .stRadio > div {
-        flex-direction: column;
-        gap: 0.3rem;
-    }
-    [data-testid="stSidebar"] label {
-        align-items: center;
-        display: flex;
-        gap: 0.5rem;
-        word-break: break-word;
-    }
-    </style>
-""", unsafe_allow_html=True)
-
-components.html(
-    """
-    <script>
-      const root = parent.document.documentElement;
-      root.setAttribute('lang', 'pt-BR');
-      root.setAttribute('translate', 'no');
-      const meta = parent.document.createElement('meta');
-      meta.name    = 'google';
-      meta.content = 'notranslate';
-      parent.document.head.appendChild(meta);
-    </script>
-    """,
-    height=0,
-)
-
 def set_tab_title(title: str, icon_url: str | None = None) -> None:
     js = f"""<script>document.title = "{title}";"""
     if icon_url:
@@ -76,69 +39,49 @@ def set_tab_title(title: str, icon_url: str | None = None) -> None:
     js += "</script>"
     st.markdown(js, unsafe_allow_html=True)
 
-def reload_module(path: str):
-    if path in sys.modules:
-        return importlib.reload(sys.modules[path])
-    return importlib.import_module(path)
-
 def mudar_pagina(alvo: str) -> None:
     if st.session_state.get("page") != alvo:
         st.session_state["page"] = alvo
         clear_caches()
         st.rerun()
 
+barramento.iniciar_execucao()
+
 # ────────────── LOGIN ──────────────
 if not usuario_logado():
     login()
     st.stop()
 
+# Rerun automático quando outra sessão altera uma tabela exibida aqui
+barramento.vigiar()
+
+# Correções de dados pendentes (uma vez por processo; falha espera antes de repetir)
+erro_migracoes = migracoes.executar_uma_vez()
+
+# Limpeza periódica de órfãos em segundo plano (uma thread por processo)
+compactacao.iniciar()
+
 # ───── SIDEBAR (TUDO antes do corpo do app) ─────
 
-# Lê menus e funcionalidades do banco
-menus = conversa_banco.select("menus", {
-    "ID": "id",
-    "Nome": "texto",
-    "Ordem": "numero100",
-})
-
-funcionalidades = conversa_banco.select("funcionalidades", {
-    "ID": "id",
-    "ID_Menu": "texto",
-    "Nome": "texto",
-    "Caminho": "texto",
-})
-
-# Organiza menus por ordem
-menus = menus.sort_values(by="Ordem")
-
-# Aplica permissões
-permissoes = menus_liberados()  # None → acesso total (admin)
-
-if permissoes is not None:
-    funcionalidades = funcionalidades[
-        funcionalidades["ID"].astype(str).isin(
-            [str(p["ID_Funcionalidade"]) for p in permissoes]
-        )
-    ]
-
-# Monta estrutura dos menus
-menu_disponivel = {}
-for _, menu in menus.iterrows():
-    # Compara como string, sempre!
-    itens = funcionalidades[funcionalidades["ID_Menu"].astype(str) == str(menu["ID"])]
-    if not itens.empty:
-        menu_disponivel[menu["Nome"]] = {
-            row["Caminho"]: row["Nome"]
-            for _, row in itens.iterrows()
-        }
+# Menus e funcionalidades liberados (árvore em cache por acesso + versões)
+acesso = acesso_usuario()
+menu_disponivel = navegacao.arvore_menus(acesso)
+
+if erro_migracoes and acesso.total:
+    st.warning(
+        f"⚠️ Falha ao executar migrações de dados (nova tentativa em até "
+        f"{migracoes.ESPERA_APOS_FALHA // 60} min): {erro_migracoes}"
+    )
 
 if not menu_disponivel:
     st.warning("⚠️ Você não tem acesso a nenhum menu.")
     st.stop()
 
 # MENU LATERAL (Sidebar)
-st.sidebar.image("imagens/logo.png", use_container_width=True)
-st.sidebar.markdown("<br>", unsafe_allow_html=True)
+st.sidebar.markdown(
+    ativos.tag_imagem("logo.png", 640, "width:100%", "Logo") + "<br><br>",
+    unsafe_allow_html=True,
+)
 
 area = st.sidebar.selectbox("Área:", list(menu_disponivel.keys()))
 
@@ -159,8 +102,12 @@ if rotulo == "Selecionar...":
 arquivo = next(k for k, v in funcionalidades_disp.items() if v == rotulo)
 set_tab_title(f"{rotulo} — Meu App")
 
+if not acesso.pode_acessar(arquivo):
+    st.error("⛔ Você não tem acesso a esta funcionalidade.")
+    st.stop()
+
 try:
-    mod = reload_module(f"paginas.{arquivo}")
+    mod = registro_paginas.carregar(arquivo)
     mod.app()
 except Exception as e:
     st.error(f"Erro ao carregar a página '{arquivo}': {e}")
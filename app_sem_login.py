@@ -4,7 +4,6 @@
 import streamlit as st
 import importlib
 import sys
-import streamlit.components.v1 as components
 
 from funcoes_compartilhadas.estilos import (
     aplicar_estilo_padrao,
@@ -16,38 +15,6 @@ from funcoes_compartilhadas.estilos import (
 st.set_page_config(page_title="Meu App com I.A.", page_icon="⚡", layout="wide")
 aplicar_estilo_padrao()
 
-# deixa o botão "radio" alinhado com o menu
-st.markdown("""
-    <style>
-    [data-testid="stSidebar"] .stRadio > div {
-        flex-direction: column;
-        gap: 0.3rem;
-    }
-    [data-testid="stSidebar"] label {
-        align-items: center;
-        display: flex;
-        gap: 0.5rem;
-        word-break: break-word;
-    }
-    </style>
-""", unsafe_allow_html=True)
-
-
-components.html(
-    """
-    <script>
-      const root = parent.document.documentElement;
-      root.setAttribute('lang', 'pt-BR');
-      root.setAttribute('translate', 'no');
-      const meta = parent.document.createElement('meta');
-      meta.name    = 'google';
-      meta.content = 'notranslate';
-      parent.document.head.appendChild(meta);
-    </script>
-    """,
-    height=0,
-)
-
 
 # ─── 2. Funções utilitárias ──────────────────────────────────────
 
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Contagens por dimensão para painéis (ex.: clientes por Convênio / Cidade / mês).
+
+• O resultado fica guardado por tabela + versão: rerun sem alteração não recalcula.
+• Se desde a última versão só houve inserções (linhas novas no fim), conta
+  apenas as linhas novas e soma ao que já havia (incremental).
+• Qualquer outra alteração → recálculo completo, vetorizado (value_counts).
+"""
+
+import threading
+import pandas as pd
+from typing import Callable, Dict
+from funcoes_compartilhadas import barramento, datas
+
+VAZIO = "(não informado)"
+
+_trava = threading.Lock()
+_estado: Dict[tuple, dict] = {}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🏷️ DIMENSÕES
+# ──────────────────────────────────────────────────────────────────────────────
+def por_coluna(coluna: str) -> Callable[[pd.DataFrame], pd.Series]:
+    """Rótulo = valor da coluna (sem espaços nas pontas; vazio → VAZIO)."""
+    def rotulo(df: pd.DataFrame) -> pd.Series:
+        if coluna not in df.columns:
+            return pd.Series(VAZIO, index=df.index)
+        texto = df[coluna].fillna("").astype(str).str.strip()
+        return texto.where(texto != "", VAZIO)
+    return rotulo
+
+
+def por_mes(coluna: str) -> Callable[[pd.DataFrame], pd.Series]:
+    """Rótulo = AAAA-MM da data da coluna."""
+    def rotulo(df: pd.DataFrame) -> pd.Series:
+        if coluna not in df.columns:
+            return pd.Series(VAZIO, index=df.index)
+        convertidas, _ = datas.interpretar_coluna(df[coluna])
+        return convertidas.dt.strftime("%Y-%m").fillna(VAZIO)
+    return rotulo
+
+
+def _contar(df: pd.DataFrame, dimensoes: Dict[str, Callable]) -> Dict[str, pd.Series]:
+    return {nome: fn(df).value_counts() for nome, fn in dimensoes.items()}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 📊 CONTAGENS
+# ──────────────────────────────────────────────────────────────────────────────
+def contagens(df: pd.DataFrame, tabela: str, versao: tuple, dimensoes: Dict[str, Callable]) -> Dict[str, pd.Series]:
+    """
+    {dimensão: Series(rótulo → quantidade)} para `df` na `versao` da tabela
+    (conversa_banco.versao). As Series devolvidas são cópias.
+    """
+    chave = (tabela, tuple(dimensoes))
+    with _trava:
+        ant = _estado.get(chave)
+
+    if ant and ant["versao"] == versao:
+        cont = ant["contagens"]
+    else:
+        incremental = False
+        if ant and ant["versao"][1] == versao[1] and len(df) >= ant["n"]:
+            ops = barramento.operacoes_desde(tabela, ant["versao"][0])
+            incremental = ops is not None and all(op == "insercao" for op in ops)
+
+        if incremental:
+            novos = _contar(df.iloc[ant["n"]:], dimensoes)
+            cont = {
+                nome: ant["contagens"][nome].add(novos[nome], fill_value=0).astype(int)
+                for nome in dimensoes
+            }
+        else:
+            cont = _contar(df, dimensoes)
+
+        with _trava:
+            _estado[chave] = {"versao": versao, "n": len(df), "contagens": cont}
+
+    return {nome: serie.copy() for nome, serie in cont.items()}
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Índice de aniversários por dia do ano (MMDD).
+
+• As datas de nascimento são interpretadas uma vez por versão da tabela.
+• As chaves MMDD ficam num vetor ordenado: "próximos N dias" vira uma ou
+  duas buscas binárias (duas quando a janela atravessa o fim do ano).
+• 29/02 em ano não bissexto é comemorado em 28/02.
+"""
+
+import calendar
+import numpy as np
+import pandas as pd
+import streamlit as st
+from datetime import date, timedelta
+from funcoes_compartilhadas import datas
+
+
+def _mmdd(d: date) -> int:
+    return d.month * 100 + d.day
+
+
+class IndiceAniversarios:
+    def __init__(self, df: pd.DataFrame, coluna: str):
+        nasc, _ = datas.interpretar_coluna(df[coluna]) if coluna in df.columns else (
+            pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]"), [])
+        ok = nasc.notna().to_numpy()
+        chaves = (nasc.dt.month * 100 + nasc.dt.day).to_numpy()[ok].astype(np.int64)
+        ordem = np.argsort(chaves, kind="stable")
+        self._chaves = chaves[ordem]
+        self._pos = np.flatnonzero(ok)[ordem]
+        self._nasc = nasc.to_numpy()
+
+    def _intervalo(self, ini: int, fim: int) -> np.ndarray:
+        a = np.searchsorted(self._chaves, ini, side="left")
+        b = np.searchsorted(self._chaves, fim, side="right")
+        return self._pos[a:b]
+
+    def proximos(self, dias: int, hoje: date | None = None) -> pd.DataFrame:
+        """
+        Aniversários de hoje até hoje + `dias`.
+        Retorna DataFrame com: pos (linha no df), aniversario (date), faltam, idade.
+
+        Nascido em 29/02, janela terminando em 28/02 de ano não bissexto:
+
+        >>> idx = IndiceAniversarios(pd.DataFrame({"n": ["29/02/2000"]}), "n")
+        >>> idx.proximos(0, date(2027, 2, 28))[["aniversario", "faltam"]].values.tolist()
+        [[datetime.date(2027, 2, 28), 0]]
+        >>> idx.proximos(59, date(2026, 12, 31))["faltam"].tolist()
+        [59]
+        """
+        hoje = hoje or date.today()
+        fim = hoje + timedelta(days=dias)
+        k_ini, k_fim = _mmdd(hoje), _mmdd(fim)
+        # 29/02 é comemorado em 28/02 quando o ano não é bissexto
+        if k_fim == 228 and not calendar.isleap(fim.year):
+            k_fim = 229
+
+        if dias >= 365:
+            pos = self._pos
+        elif fim.year == hoje.year:
+            pos = self._intervalo(k_ini, k_fim)
+        else:
+            pos = np.concatenate([self._intervalo(k_ini, 1231), self._intervalo(101, k_fim)])
+
+        nasc = pd.DatetimeIndex(self._nasc[pos])
+        chave = nasc.month * 100 + nasc.day
+        ano = np.where(chave >= k_ini, hoje.year, hoje.year + 1)
+
+        aniversario = pd.to_datetime(
+            {"year": ano, "month": nasc.month, "day": nasc.day}, errors="coerce"
+        )
+        fev28 = pd.to_datetime({"year": ano, "month": 2, "day": 28})
+        aniversario = aniversario.fillna(fev28)
+
+        res = pd.DataFrame({
+            "pos": pos,
+            "aniversario": aniversario.dt.date,
+            "faltam": (aniversario - pd.Timestamp(hoje)).dt.days,
+            "idade": ano - nasc.year,
+        })
+        res = res[res["faltam"] <= dias]
+        return res.sort_values(["faltam", "pos"], kind="stable").reset_index(drop=True)
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _indice_cache(tabela: str, versao, coluna: str, _df: pd.DataFrame) -> IndiceAniversarios:
+    return IndiceAniversarios(_df, coluna)
+
+
+def proximos_aniversarios(df: pd.DataFrame, tabela: str, versao, dias: int = 7,
+                          coluna: str = "Data de Nascimento", hoje: date | None = None) -> pd.DataFrame:
+    """
+    Linhas de `df` com aniversário nos próximos `dias` (índice em cache por versão),
+    acrescidas de "Aniversário", "Faltam (dias)" e "Idade".
+    """
+    achados = _indice_cache(tabela, versao, coluna, df).proximos(dias, hoje)
+    res = df.iloc[achados["pos"]].reset_index(drop=True)
+    res["Aniversário"] = pd.to_datetime(achados["aniversario"]).dt.strftime("%d/%m")
+    res["Faltam (dias)"] = achados["faltam"].to_numpy()
+    res["Idade"] = achados["idade"].to_numpy()
+    return res
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Imagens otimizadas para a interface (imagens/ → static/).
+
+• Cada imagem é reduzida para a largura pedida e gravada uma única vez em
+  static/ como PNG otimizado e WebP (regerada só se o original for mais novo).
+• Com server.enableStaticServing (.streamlit/config.toml) as páginas recebem
+  apenas a URL app/static/...: o navegador guarda a imagem em cache e nada
+  trafega pelo websocket a cada rerun.
+• Sem static serving: data URI montado uma vez por processo.
+"""
+
+import os
+import base64
+import threading
+import streamlit as st
+from PIL import Image
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASTA_IMAGENS = os.path.join(RAIZ, "imagens")
+PASTA_STATIC = os.path.join(RAIZ, "static")
+URL_STATIC = "app/static"
+
+QUALIDADE_WEBP = 85
+_MIME = {"png": "image/png", "webp": "image/webp"}
+_trava = threading.Lock()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🛠️ GERAÇÃO
+# ──────────────────────────────────────────────────────────────────────────────
+def _gerar(nome: str, largura: int, formato: str) -> str:
+    """Grava (se preciso) a versão otimizada e devolve o caminho do arquivo."""
+    origem = os.path.join(PASTA_IMAGENS, nome)
+    base = os.path.splitext(nome)[0]
+    destino = os.path.join(PASTA_STATIC, f"{base}_{largura}.{formato}")
+
+    with _trava:
+        if os.path.exists(destino) and os.path.getmtime(destino) >= os.path.getmtime(origem):
+            return destino
+
+        with Image.open(origem) as img:
+            img = img.convert("RGBA" if "A" in img.getbands() or img.mode == "P" else "RGB")
+            if img.width > largura:
+                altura = max(1, round(img.height * largura / img.width))
+                img = img.resize((largura, altura), Image.LANCZOS)
+
+            os.makedirs(PASTA_STATIC, exist_ok=True)
+            temporario = f"{destino}.tmp"
+            if formato == "webp":
+                img.save(temporario, "WEBP", quality=QUALIDADE_WEBP, method=6)
+            else:
+                img.save(temporario, "PNG", optimize=True)
+            os.replace(temporario, destino)
+    return destino
+
+
+@st.cache_resource(show_spinner=False)
+def _arquivo(nome: str, largura: int, formato: str) -> str:
+    return _gerar(nome, largura, formato)
+
+
+@st.cache_resource(show_spinner=False)
+def _data_uri(nome: str, largura: int, formato: str) -> str:
+    with open(_arquivo(nome, largura, formato), "rb") as f:
+        b64 = base64.b64encode(f.read()).decode()
+    return f"data:{_MIME[formato]};base64,{b64}"
+
+
+def _static_ativo() -> bool:
+    try:
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🔗 USO NAS PÁGINAS
+# ──────────────────────────────────────────────────────────────────────────────
+def url(nome: str, largura: int = 480, formato: str = "webp") -> str:
+    """URL da imagem `imagens/<nome>` com `largura` px (static ou data URI)."""
+    if _static_ativo():
+        return f"{URL_STATIC}/{os.path.basename(_arquivo(nome, largura, formato))}"
+    return _data_uri(nome, largura, formato)
+
+
+def tag_imagem(nome: str, largura: int = 480, estilo: str = "", alt: str = "") -> str:
+    """<img>/<picture> pronto para st.markdown (WebP com PNG de reserva)."""
+    img = f'<img src="{url(nome, largura, "png")}" alt="{alt}" style="{estilo}" />'
+    if not _static_ativo():
+        return f'<img src="{url(nome, largura, "webp")}" alt="{alt}" style="{estilo}" />'
+    return f'<picture><source srcset="{url(nome, largura, "webp")}" type="image/webp">{img}</picture>'
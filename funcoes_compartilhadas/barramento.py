@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Barramento de alterações entre sessões (um por processo).
+
+• conversa_banco publica cada escrita: a tabela ganha uma nova versão.
+• Caches usam a versão da tabela como chave → só o que depende da tabela
+  alterada é descartado; o resto continua valendo para todos os usuários.
+• Cada sessão "assina" as tabelas que leu na execução atual; o fragmento
+  vigiar() confere as versões de tempos em tempos e faz rerun quando outra
+  sessão alterou alguma delas. Escritas da própria sessão não contam.
+"""
+
+import time
+import threading
+from collections import deque
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Alterações feitas direto na planilha (fora do app) aparecem em até VALIDADE_CACHE s
+VALIDADE_CACHE = 300
+INTERVALO_VERIFICACAO = 10
+
+_CHAVE_SESSAO = "_versoes_vistas"
+_INICIO = time.time_ns()
+_trava = threading.Lock()
+_versoes: dict[str, int] = {}
+_historico: dict[str, deque] = {}
+_TAMANHO_HISTORICO = 200
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 📣 PUBLICAÇÃO
+# ──────────────────────────────────────────────────────────────────────────────
+def publicar(tabela: str, operacao: str = "alteracao") -> None:
+    """
+    Registra que `tabela` foi alterada.
+    operacao: "insercao" (só linhas novas no fim) ou "alteracao" (qualquer outra).
+    """
+    with _trava:
+        nova = _versoes.get(tabela, _INICIO) + 1
+        _versoes[tabela] = nova
+        _historico.setdefault(tabela, deque(maxlen=_TAMANHO_HISTORICO)).append((nova, operacao))
+    _marcar_vista(tabela, nova)
+
+
+def _marcar_vista(tabela: str, nova: int) -> None:
+    """
+    Escrita feita pelo script da sessão: a sessão já conhece a versão nova,
+    então vigiar() não faz rerun (e não apaga mensagens/resumos da página).
+    Só avança se a sessão tinha a versão anterior – se outra sessão escreveu
+    no meio, o rerun continua acontecendo.
+    """
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return  # thread de fundo: não há sessão
+    try:
+        vistas = st.session_state.get(_CHAVE_SESSAO)
+        if vistas is not None and vistas.get(tabela) == nova - 1:
+            vistas[tabela] = nova
+    except Exception:
+        pass
+
+
+def operacoes_desde(tabela: str, versao_antiga: int) -> list | None:
+    """
+    Operações publicadas depois de `versao_antiga` (em ordem).
+    None se o histórico guardado não cobre todo o intervalo.
+    """
+    with _trava:
+        atual = _versoes.get(tabela, _INICIO)
+        hist = list(_historico.get(tabela, ()))
+    if versao_antiga == atual:
+        return []
+    ops = [op for v, op in hist if v > versao_antiga]
+    return ops if len(ops) == atual - versao_antiga else None
+
+
+def versao_escrita(tabela: str) -> int:
+    """Contador de escritas da tabela neste processo."""
+    return _versoes.get(tabela, _INICIO)
+
+
+def versao(tabela: str) -> tuple:
+    """Chave de cache: muda a cada escrita e também a cada VALIDADE_CACHE segundos."""
+    return versao_escrita(tabela), int(time.time() // VALIDADE_CACHE)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🔔 ASSINATURAS DA SESSÃO
+# ──────────────────────────────────────────────────────────────────────────────
+def iniciar_execucao() -> None:
+    """Chamar no início do script: esquece as tabelas lidas na execução anterior."""
+    st.session_state[_CHAVE_SESSAO] = {}
+
+
+def assinar(tabela: str) -> None:
+    """Marca que a sessão atual exibe dados de `tabela`."""
+    try:
+        st.session_state.setdefault(_CHAVE_SESSAO, {})[tabela] = versao_escrita(tabela)
+    except Exception:
+        # fora de uma sessão (thread de fundo, script avulso)
+        pass
+
+
+@st.fragment(run_every=INTERVALO_VERIFICACAO)
+def vigiar() -> None:
+    """Rerun da página quando alguma tabela assinada mudou em outra sessão."""
+    vistas = st.session_state.get(_CHAVE_SESSAO, {})
+    if any(versao_escrita(t) != v for t, v in vistas.items()):
+        st.rerun()
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Busca de CEP offline (sem chamada de rede).
+
+• compilar_indice(): converte uma base de CEPs em CSV num SQLite compacto
+  (CEP como chave inteira, tabela WITHOUT ROWID). Rodar uma vez:
+      python -m funcoes_compartilhadas.cep caminho/da/base.csv
+• buscar_cep(): consulta o arquivo aberto somente leitura e mapeado em
+  memória (PRAGMA mmap_size) — cada busca é uma leitura na árvore B.
+• Sem o arquivo dados/cep.sqlite a busca só devolve None (recurso desligado).
+"""
+
+import os
+import re
+import sys
+import sqlite3
+import unicodedata
+from functools import lru_cache
+import pandas as pd
+import streamlit as st
+
+PASTA_RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+ARQUIVO_INDICE = os.path.join(PASTA_RAIZ, "dados", "cep.sqlite")
+TAMANHO_MMAP = 256 * 1024 * 1024
+
+# Nomes aceitos para cada coluna da base de origem (sem acento, minúsculo)
+COLUNAS_ORIGEM = {
+    "cep": ["cep"],
+    "logradouro": ["logradouro", "endereco", "rua"],
+    "bairro": ["bairro"],
+    "cidade": ["cidade", "localidade", "municipio"],
+    "uf": ["uf", "estado"],
+}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🏗️ COMPILAÇÃO DO ÍNDICE
+# ──────────────────────────────────────────────────────────────────────────────
+def _sem_acento(texto: str) -> str:
+    t = unicodedata.normalize("NFKD", str(texto).strip().lower())
+    return t.encode("ascii", "ignore").decode("ascii")
+
+
+def _mapear_colunas(colunas) -> dict:
+    norm = {_sem_acento(c): c for c in colunas}
+    mapa = {}
+    for destino, nomes in COLUNAS_ORIGEM.items():
+        achada = next((norm[n] for n in nomes if n in norm), None)
+        if achada is None:
+            raise ValueError(f"Coluna '{destino}' não encontrada na base de CEPs.")
+        mapa[achada] = destino
+    return mapa
+
+
+def compilar_indice(origem: str, destino: str = ARQUIVO_INDICE, tamanho_bloco: int = 100_000) -> int:
+    """Gera o SQLite a partir do CSV. Retorna a quantidade de CEPs gravados."""
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    temporario = destino + ".tmp"
+    if os.path.exists(temporario):
+        os.remove(temporario)
+
+    con = sqlite3.connect(temporario)
+    try:
+        con.execute("PRAGMA journal_mode = OFF")
+        con.execute("PRAGMA synchronous = OFF")
+        con.execute(
+            "CREATE TABLE cep (cep INTEGER PRIMARY KEY, logradouro TEXT, "
+            "bairro TEXT, cidade TEXT, uf TEXT) WITHOUT ROWID"
+        )
+        mapa = None
+        for bloco in pd.read_csv(origem, sep=None, engine="python", dtype=str,
+                                 encoding="utf-8-sig", chunksize=tamanho_bloco):
+            mapa = mapa or _mapear_colunas(bloco.columns)
+            bloco = bloco[list(mapa)].rename(columns=mapa).fillna("")
+            bloco["cep"] = pd.to_numeric(bloco["cep"].str.replace(r"\D", "", regex=True), errors="coerce")
+            bloco = bloco.dropna(subset=["cep"]).astype({"cep": "int64"})
+            con.executemany(
+                "INSERT OR REPLACE INTO cep VALUES (?, ?, ?, ?, ?)",
+                bloco[["cep", "logradouro", "bairro", "cidade", "uf"]].itertuples(index=False, name=None),
+            )
+        con.commit()
+        total = con.execute("SELECT COUNT(*) FROM cep").fetchone()[0]
+        con.execute("VACUUM")
+    finally:
+        con.close()
+
+    os.replace(temporario, destino)
+    return total
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🔎 CONSULTA
+# ──────────────────────────────────────────────────────────────────────────────
+def disponivel() -> bool:
+    return os.path.exists(ARQUIVO_INDICE)
+
+
+@st.cache_resource(show_spinner=False)
+def _conexao(caminho: str, mtime: float) -> sqlite3.Connection:
+    con = sqlite3.connect(f"file:{caminho}?mode=ro&immutable=1", uri=True, check_same_thread=False)
+    con.execute(f"PRAGMA mmap_size = {TAMANHO_MMAP}")
+    return con
+
+
+@lru_cache(maxsize=2048)
+def _buscar(numero: int, mtime: float) -> tuple | None:
+    con = _conexao(ARQUIVO_INDICE, mtime)
+    return con.execute(
+        "SELECT logradouro, bairro, cidade, uf FROM cep WHERE cep = ?", (numero,)
+    ).fetchone()
+
+
+def buscar_cep(cep) -> dict | None:
+    """{"logradouro", "bairro", "cidade", "uf"} do CEP ou None."""
+    digitos = re.sub(r"\D", "", str(cep or ""))
+    if len(digitos) != 8 or not disponivel():
+        return None
+    # mtime na chave: um índice recompilado é reaberto automaticamente
+    linha = _buscar(int(digitos), os.path.getmtime(ARQUIVO_INDICE))
+    if not linha:
+        return None
+    return dict(zip(("logradouro", "bairro", "cidade", "uf"), linha))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python -m funcoes_compartilhadas.cep base_de_ceps.csv")
+        sys.exit(1)
+    qtd = compilar_indice(sys.argv[1])
+    print(f"\n✅ {qtd} CEPs gravados em:\n{ARQUIVO_INDICE}")
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Compactação periódica de órfãos (linhas cujo FK aponta para um ID que não existe).
+
+• Uma thread de fundo por processo (iniciar() fica em cache_resource).
+• Cada passada chama conversa_banco.compactar_orfaos(): uma leitura de todas as
+  abas relacionadas e um único batch_update.
+• O resultado da última passada fica em estado() para consulta.
+"""
+
+import time
+import threading
+from datetime import datetime
+import streamlit as st
+from funcoes_compartilhadas import conversa_banco
+
+# Segundos entre passadas; a primeira espera o app terminar de subir
+INTERVALO = 6 * 3600
+ESPERA_INICIAL = 60
+
+_trava = threading.Lock()
+_estado = {"execucoes": 0, "ultima": None, "removidas": {}, "erro": ""}
+
+
+def _passada() -> None:
+    try:
+        removidas = conversa_banco.compactar_orfaos()
+        erro = ""
+    except Exception as e:
+        removidas, erro = {}, str(e)
+    with _trava:
+        _estado["execucoes"] += 1
+        _estado["ultima"] = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+        _estado["removidas"] = removidas
+        _estado["erro"] = erro
+
+
+def _rodar(intervalo: float, espera_inicial: float) -> None:
+    time.sleep(espera_inicial)
+    while True:
+        _passada()
+        time.sleep(intervalo)
+
+
+@st.cache_resource(show_spinner=False)
+def iniciar(intervalo: float = INTERVALO, espera_inicial: float = ESPERA_INICIAL) -> threading.Thread:
+    """Sobe a thread de compactação (uma vez por processo)."""
+    thread = threading.Thread(
+        target=_rodar, args=(intervalo, espera_inicial), name="compacta-orfaos", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def estado() -> dict:
+    with _trava:
+        return {**_estado, "removidas": dict(_estado["removidas"])}
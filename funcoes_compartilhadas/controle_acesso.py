@@ -11,24 +11,21 @@ Controle de Acesso Genérico
 import streamlit as st
 import pandas as pd
 import hashlib
-from funcoes_compartilhadas import conversa_banco
-from PIL import Image
-import base64
-from io import BytesIO
-
-
-# imagem
-def image_base64(path):
-    img = Image.open(path)
-    buffer = BytesIO()
-    img.save(buffer, format="PNG")
-    b64 = base64.b64encode(buffer.getvalue()).decode()
-    return f"data:image/png;base64,{b64}"
+import hmac
+import time
+import string
+import secrets
+import threading
+from funcoes_compartilhadas import conversa_banco, barramento, ativos
 
 
 # 🔐 Tabelas usadas no Google Sheets
 TABELA_USUARIOS = "usuarios"
 TABELA_PERMISSOES = "permissoes"
+TABELA_FUNCIONALIDADES = "funcionalidades"
+TABELA_PERFIS = "perfis"
+TABELA_PERFIS_FUNCIONALIDADES = "perfis_funcionalidades"
+TABELA_USUARIOS_PERFIS = "usuarios_perfis"
 
 TIPOS_USUARIOS = {
     "ID": "id",
@@ -40,10 +37,38 @@ TIPOS_USUARIOS = {
 TIPOS_PERMISSOES = {
     "ID": "id",
     "ID_Usuario": "texto",
-    "Programa": "texto",
+    "ID_Funcionalidade": "texto",
+}
+
+TIPOS_FUNCIONALIDADES = {
+    "ID": "id",
+    "ID_Menu": "texto",
+    "Nome": "texto",
     "Caminho": "texto",
 }
 
+TIPOS_PERFIS = {
+    "ID": "id",
+    "Nome": "texto",
+}
+
+TIPOS_PERFIS_FUNCIONALIDADES = {
+    "ID": "id",
+    "ID_Perfil": "texto",
+    "ID_Funcionalidade": "texto",
+}
+
+TIPOS_USUARIOS_PERFIS = {
+    "ID": "id",
+    "ID_Usuario": "texto",
+    "ID_Perfil": "texto",
+}
+
+# IDs de usuário com acesso total
+ADMINS = ("1", "ADMIN")
+
+_trava_codigos = threading.Lock()
+
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 🔑 Função para criptografar senha
@@ -51,23 +76,49 @@ def hash_senha(senha: str) -> str:
     return hashlib.sha256(senha.encode()).hexdigest()
 
 
+# ──────────────────────────────────────────────────────────────────────────────
+# 📇 Diretório de usuários (email normalizado → usuário)
+# Montado uma vez por versão da tabela "usuarios": login vira consulta a dicionário.
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _diretorio_usuarios(versao) -> dict:
+    df = conversa_banco.select(TABELA_USUARIOS, TIPOS_USUARIOS)
+    if df.empty:
+        return {}
+    df = df.assign(_email=normalizar_email_serie(df["Email"]))
+    df = df[df["_email"] != ""].drop_duplicates("_email", keep="first")
+    colunas = [c for c in TIPOS_USUARIOS if c in df.columns]
+    return dict(zip(df["_email"], df[colunas].to_dict("records")))
+
+
+def normalizar_email_serie(serie: pd.Series) -> pd.Series:
+    return serie.fillna("").astype(str).str.strip().str.lower()
+
+
+def emails_cadastrados() -> set:
+    """Emails (normalizados) que já têm usuário."""
+    return set(_diretorio_usuarios(conversa_banco.versao(TABELA_USUARIOS)))
+
+
+def buscar_usuario(email: str) -> dict | None:
+    usuario = _diretorio_usuarios(conversa_banco.versao(TABELA_USUARIOS)).get(str(email).strip().lower())
+    return dict(usuario) if usuario else None
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # 🚪 Login
 # ──────────────────────────────────────────────────────────────────────────────
 
 def login():
-    from funcoes_compartilhadas.envia_email import enviar_email
-    import random, string
-
-    col1, col2, col3 = st.columns([0.35, 0.3, 0.35])
+    # CSS da tela em estilos.CSS_LOGIN (escopo .st-key-login)
+    col1, col2, col3 = st.container(key="login").columns([0.35, 0.3, 0.35])
 
     with col2:
         # ─── Logo ────────────────────────────────────────────────
-        logo_data = image_base64("imagens/logo.png")
+        logo = ativos.tag_imagem("logo.png", 480, "width:70%; max-width:240px; margin-bottom:40px", "Logo")
         st.markdown(
             f"""
             <div style="text-align: center;">
-                <img src="{logo_data}" style="width:70%; max-width:240px; margin-bottom:40px" />
+                {logo}
             </div>
             """,
             unsafe_allow_html=True
@@ -80,100 +131,25 @@ def login():
         email = st.text_input("Email", key="login_email")
         senha = st.text_input("Senha", type="password", key="login_senha")
 
-        # ─── CSS do campo senha ───────────────────────────────────
-        st.markdown("""
-            <style>
-            div[data-testid="stTextInput"] > div:first-child {
-                position: relative !important;
-            }
-            div[data-testid="stTextInput"] svg {
-                position: absolute !important;
-                right: 12px !important;
-                top: 2.5em !important;
-                transform: none !important;
-                z-index: 2;
-                pointer-events: none;
-            }
-            input[type="password"] {
-                padding-right: 2.5rem !important;
-            }
-            </style>
-        """, unsafe_allow_html=True)
-
-        # ─── CSS do botão Entrar ──────────────────────────────────
-        st.markdown("""
-            <style>
-            div[data-testid="stButton"] > button {
-                display: block;
-                margin: 0 auto;
-                background-color:#4CAF50;
-                color:#ffffff;
-                font-size:14px;
-                padding:6px 20px;
-                border:none;
-                border-radius:5px;
-                transition: background-color 0.2s ease;
-            }
-            div[data-testid="stButton"] > button:hover {
-                background-color: #388E3C;
-                color: white;
-            }
-            </style>
-        """, unsafe_allow_html=True)
-
         # ─── Botão Entrar ─────────────────────────────────────────
         if st.button("Entrar", key="login_botao"):
-            df = conversa_banco.select(TABELA_USUARIOS, TIPOS_USUARIOS)
-            df = df[df["Email"].str.lower() == email.lower()]
-            st.write("Debug DF Usuarios:", df)
-            if not df.empty:
-                senha_hash = hash_senha(senha)
-
-                #Debug
-                st.write("Hash digitado:", senha_hash)
-                st.write("Hash planilha:", df.iloc[0]["Senha"])
-
-                
-                if df.iloc[0]["Senha"] == senha_hash:
+            usuario = buscar_usuario(email)
+            if usuario:
+                if usuario["Senha"] == hash_senha(senha):
                     st.session_state["usuario_logado"] = {
-                        "ID": str(df.iloc[0]["ID"]),
-                        "Nome": df.iloc[0]["Nome"],
-                        "Email": df.iloc[0]["Email"],
+                        "ID": str(usuario["ID"]),
+                        "Nome": usuario["Nome"],
+                        "Email": usuario["Email"],
                     }
-                    st.success(f"✅ Bem-vindo, {df.iloc[0]['Nome']}!")
+                    st.success(f"✅ Bem-vindo, {usuario['Nome']}!")
                     st.rerun()
                 else:
                     st.error("❌ Senha incorreta.")
             else:
                 st.error("❌ Usuário não encontrado.")
 
-        # ─── CSS para centralizar o botão popover ─────────────────
-        st.markdown("""
-            <style>
-            div[data-testid="stPopoverContainer"] > button {
-                display: block;
-                margin-left: auto;
-                margin-right: auto;
-            }
-            </style>
-        """, unsafe_allow_html=True)
-
         # ─── Link de redefinição com hover estilizado ─────────────
         st.markdown("""
-            <style>
-            a.link-esqueci:link,
-            a.link-esqueci:visited {
-                text-decoration: none;
-                color: #777 !important;
-                font-size: 12px;
-                font-weight: normal;
-            }
-
-            a.link-esqueci:hover {
-                color: #1976D2 !important;
-                font-weight: bold;
-            }
-            </style>
             <div style='text-align:center; margin-top:10px'>
                 <a href='?recuperar=1' class='link-esqueci'>
                     Esqueci minha senha
@@ -182,10 +158,161 @@ def login():
         """, unsafe_allow_html=True)
 
 
+# ──────────────────────────────────────────────────────────────────────────────
+# 📨 Recuperação de senha (?recuperar=1)
+# 1) Pedido: gera um código, guarda só o hash com validade e enfileira o e-mail
+#    (o script não espera o SMTP; o status vem da fila por um fragmento).
+# 2) Confirmação: código certo dentro da validade → grava a senha escolhida.
+# A senha atual só muda no passo 2: e-mail que falha ou pedido de terceiros não
+# trancam ninguém fora.
+VALIDADE_CODIGO = 15 * 60      # s
+TENTATIVAS_CODIGO = 5
+
+
+@st.cache_resource(show_spinner=False)
+def _codigos_pendentes() -> dict:
+    """{ID do usuário: {"hash", "expira", "tentativas"}} – um por processo."""
+    return {}
+
+
+def pedir_codigo_recuperacao(usuario_id) -> str:
+    """Novo código para o usuário (substitui o anterior) e devolve o código em texto."""
+    codigo = "".join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(8))
+    pendentes = _codigos_pendentes()
+    with _trava_codigos:
+        agora = time.time()
+        for uid in [u for u, p in pendentes.items() if p["expira"] < agora]:
+            del pendentes[uid]
+        pendentes[str(usuario_id)] = {
+            "hash": hash_senha(codigo), "expira": agora + VALIDADE_CODIGO, "tentativas": 0,
+        }
+    return codigo
 
 
+def descartar_codigo_recuperacao(usuario_id) -> None:
+    with _trava_codigos:
+        _codigos_pendentes().pop(str(usuario_id), None)
 
 
+def confirmar_recuperacao(usuario_id, codigo: str, nova_senha: str) -> str:
+    """
+    Confere o código e, se válido, grava a nova senha.
+    Retorna "" em caso de sucesso ou a mensagem de erro.
+    """
+    uid = str(usuario_id)
+    with _trava_codigos:
+        pendente = _codigos_pendentes().get(uid)
+        if not pendente or pendente["expira"] < time.time():
+            _codigos_pendentes().pop(uid, None)
+            return "Código expirado. Peça um novo código."
+        if not hmac.compare_digest(pendente["hash"], hash_senha(codigo.strip().upper())):
+            pendente["tentativas"] += 1
+            if pendente["tentativas"] >= TENTATIVAS_CODIGO:
+                _codigos_pendentes().pop(uid, None)
+                return "Código incorreto. Limite de tentativas atingido: peça um novo código."
+            return "Código incorreto."
+        _codigos_pendentes().pop(uid, None)
+
+    if not conversa_banco.update_lote(TABELA_USUARIOS, {uid: {"Senha": hash_senha(nova_senha)}}, "ID", TIPOS_USUARIOS):
+        return "Não foi possível gravar a nova senha."
+    return ""
+
+
+def recuperar_senha():
+    col1, col2, col3 = st.container(key="login").columns([0.35, 0.3, 0.35])
+
+    with col2:
+        st.markdown("<h3 style='text-align:center; color:#444;'>Recuperar Senha</h3>", unsafe_allow_html=True)
+
+        if st.session_state.get("recuperar_concluido"):
+            st.success("✅ Senha alterada. Entre com a nova senha.")
+        else:
+            _recuperar_formulario()
+
+        st.markdown("""
+            <div style='text-align:center; margin-top:10px'>
+                <a href='?' target='_self' class='link-esqueci'>
+                    Voltar ao login
+                </a>
+            </div>
+        """, unsafe_allow_html=True)
+
+
+def _recuperar_formulario():
+    from funcoes_compartilhadas.envia_email import enfileirar_email, fila_padrao, ENVIADO, FALHOU
+
+    email = st.text_input("Email", key="recuperar_email")
+
+    if st.button("Enviar código", key="recuperar_botao"):
+        usuario = buscar_usuario(email)
+        if not usuario:
+            st.error("❌ Usuário não encontrado.")
+        else:
+            codigo = pedir_codigo_recuperacao(usuario["ID"])
+            mensagem = (
+                f"<p>Olá, {usuario['Nome']}.</p>"
+                f"<p>Seu código para redefinir a senha é: <b>{codigo}</b></p>"
+                f"<p>Ele vale por {VALIDADE_CODIGO // 60} minutos. "
+                "Se você não pediu a troca, ignore este e-mail: sua senha continua a mesma.</p>"
+            )
+            try:
+                st.session_state["recuperar_id_email"] = enfileirar_email(
+                    usuario["Email"], "Recuperação de senha", mensagem
+                )
+                st.session_state["recuperar_usuario"] = str(usuario["ID"])
+            except Exception as e:
+                descartar_codigo_recuperacao(usuario["ID"])
+                st.error(f"❌ Erro ao enviar e-mail: {e}")
+
+    id_msg = st.session_state.get("recuperar_id_email")
+    usuario_id = st.session_state.get("recuperar_usuario")
+    if not id_msg or not usuario_id:
+        return
+
+    atual = fila_padrao().status(id_msg) or {}
+    pendente = atual.get("status") not in (ENVIADO, FALHOU)
+
+    # Consulta a fila a cada 2 s enquanto o envio não termina
+    @st.fragment(run_every=2 if pendente else None)
+    def _status_envio():
+        atual = fila_padrao().status(id_msg) or {}
+        status = atual.get("status")
+        if status == ENVIADO:
+            st.success("✅ Código enviado para o seu e-mail.")
+        elif status == FALHOU:
+            descartar_codigo_recuperacao(usuario_id)
+            st.error(f"❌ Erro ao enviar e-mail: {atual.get('erro') or 'falha no envio'}. Sua senha não foi alterada.")
+        elif not atual:
+            st.warning("⚠️ Status do envio indisponível.")
+        else:
+            st.info("📨 Enviando e-mail…")
+        if pendente and status in (ENVIADO, FALHOU):
+            st.rerun()  # terminou: redesenha sem o intervalo
+
+    _status_envio()
+
+    if atual.get("status") != ENVIADO:
+        return
+
+    # ─── Confirmação ──────────────────────────────────────────
+    codigo = st.text_input("Código recebido", key="recuperar_codigo")
+    nova = st.text_input("Nova senha", type="password", key="recuperar_nova")
+    repetida = st.text_input("Repita a nova senha", type="password", key="recuperar_repetida")
+    if st.button("Redefinir senha", key="recuperar_confirmar"):
+        if not codigo.strip() or not nova:
+            st.error("❌ Preencha o código e a nova senha.")
+        elif nova != repetida:
+            st.error("❌ As senhas não conferem.")
+        else:
+            erro = confirmar_recuperacao(usuario_id, codigo, nova)
+            if erro:
+                st.error(f"❌ {erro}")
+            else:
+                for chave in ("recuperar_id_email", "recuperar_usuario"):
+                    st.session_state.pop(chave, None)
+                st.session_state["recuperar_concluido"] = True
+                st.rerun()
+
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 🔓 Logout
@@ -205,23 +332,8 @@ def logoutX():
             unsafe_allow_html=True,
         )
     st.sidebar.markdown("\n")
-    st.markdown("""
-        <style>
-        section[data-testid="stSidebar"] .stButton:last-of-type {
-            display: flex; justify-content: center;
-        }
-        section[data-testid="stSidebar"] .stButton:last-of-type button {
-            background-color:#e0e0e0;color:#333;font-size:14px;
-            padding:6px 20px;border:none;border-radius:5px;
-        }
-        section[data-testid="stSidebar"] .stButton:last-of-type button:hover {
-            background-color:#f44336;color:white;
-        }
-        header[data-testid="stHeader"] div[role="button"]{display:none!important;}
-        </style>
-    """, unsafe_allow_html=True)
-
-    if st.sidebar.button("Sair"):
+    # CSS do botão em estilos.CSS_SAIR (escopo .st-key-sair)
+    if st.sidebar.container(key="sair").button("Sair"):
         st.session_state.pop("usuario_logado", None)        
         st.session_state.clear()
         st.rerun()
@@ -235,28 +347,205 @@ def usuario_logado():
 
 
 # ──────────────────────────────────────────────────────────────────────────────
-# ✅ Verificar permissões de menus
-def menus_liberados():
-    if not usuario_logado():
-        return []
+# ✅ Permissões compiladas
+# Por usuário: conjunto imutável de IDs de funcionalidade e de Caminhos liberados.
+# Guardado entre sessões por (usuário, versão de permissoes, versão de funcionalidades)
+# e na sessão → conferir acesso a uma página é consulta a conjunto, sem I/O.
+class Acesso:
+    __slots__ = ("total", "funcionalidades", "caminhos")
+
+    def __init__(self, total: bool = False, funcionalidades=(), caminhos=()):
+        self.total = total
+        self.funcionalidades = frozenset(funcionalidades)
+        self.caminhos = frozenset(caminhos)
+
+    def pode_acessar(self, caminho: str) -> bool:
+        return self.total or caminho in self.caminhos
+
+    def libera(self, id_funcionalidade) -> bool:
+        return self.total or str(id_funcionalidade) in self.funcionalidades
+
+
+ACESSO_TOTAL = Acesso(total=True)
+SEM_ACESSO = Acesso()
+
+_CHAVE_ACESSO = "_acesso_compilado"
+
+
+def _texto(serie: pd.Series) -> pd.Series:
+    return serie.fillna("").astype(str).str.strip()
 
-    usuario_id = str(st.session_state["usuario_logado"]["ID"])
 
-    # 🔥 Admin (ID=1 ou ADMIN) vê tudo
-    if usuario_id in ["1", "ADMIN"]:
-        return None
+@st.cache_resource(show_spinner=False)
+def garantir_tabelas_perfis() -> None:
+    """Cria as abas de perfis se ainda não existirem (uma vez por processo)."""
+    for tabela, tipos in (
+        (TABELA_PERFIS, TIPOS_PERFIS),
+        (TABELA_PERFIS_FUNCIONALIDADES, TIPOS_PERFIS_FUNCIONALIDADES),
+        (TABELA_USUARIOS_PERFIS, TIPOS_USUARIOS_PERFIS),
+    ):
+        conversa_banco.garantir_tabela(tabela, list(tipos))
 
-    df = conversa_banco.select("permissoes", {
-        "ID": "id",
-        "ID_Usuario": "texto",
-        "ID_Funcionalidade": "texto",
-    })
 
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _grupos(tabela: str, col_grupo: str, col_item: str, versao) -> dict:
+    """{grupo: frozenset(itens)} – um groupby por tabela e versão."""
+    if tabela in (TABELA_PERFIS_FUNCIONALIDADES, TABELA_USUARIOS_PERFIS):
+        garantir_tabelas_perfis()
+    df = conversa_banco.select(tabela, {"ID": "id", col_grupo: "texto", col_item: "texto"})
+    if df.empty or col_grupo not in df.columns or col_item not in df.columns:
+        return {}
+    df = pd.DataFrame({"g": _texto(df[col_grupo]), "i": _texto(df[col_item])})
+    return {g: frozenset(i) for g, i in df.groupby("g", sort=False)["i"]}
+
+
+# Cada uma: {grupo: frozenset(itens)} na versão atual da tabela
+def permissoes_atuais() -> dict:
+    """{ID_Usuario: frozenset(ID_Funcionalidade)} – permissões diretas."""
+    return _grupos(TABELA_PERMISSOES, "ID_Usuario", "ID_Funcionalidade",
+                   conversa_banco.versao(TABELA_PERMISSOES))
+
+
+def funcionalidades_por_perfil() -> dict:
+    """{ID_Perfil: frozenset(ID_Funcionalidade)}"""
+    return _grupos(TABELA_PERFIS_FUNCIONALIDADES, "ID_Perfil", "ID_Funcionalidade",
+                   conversa_banco.versao(TABELA_PERFIS_FUNCIONALIDADES))
+
+
+def perfis_por_usuario() -> dict:
+    """{ID_Usuario: frozenset(ID_Perfil)}"""
+    return _grupos(TABELA_USUARIOS_PERFIS, "ID_Usuario", "ID_Perfil",
+                   conversa_banco.versao(TABELA_USUARIOS_PERFIS))
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _caminhos_por_funcionalidade(versao) -> dict:
+    """{ID da funcionalidade: Caminho}"""
+    df = conversa_banco.select(TABELA_FUNCIONALIDADES, TIPOS_FUNCIONALIDADES)
     if df.empty:
-        return []
+        return {}
+    return dict(zip(_texto(df["ID"]), _texto(df["Caminho"])))
+
+
+# Tabelas que entram na chave das permissões compiladas
+_TABELAS_ACESSO = (
+    TABELA_PERMISSOES, TABELA_FUNCIONALIDADES,
+    TABELA_PERFIS_FUNCIONALIDADES, TABELA_USUARIOS_PERFIS,
+)
+
 
-    df = df[df["ID_Usuario"] == usuario_id]
+@st.cache_resource(max_entries=256, show_spinner=False)
+def _compilar(usuario_id: str, versao_permissoes, versao_funcionalidades,
+              versao_perfis_funcionalidades, versao_usuarios_perfis) -> Acesso:
+    ids = _grupos(TABELA_PERMISSOES, "ID_Usuario", "ID_Funcionalidade",
+                  versao_permissoes).get(usuario_id, frozenset())
+    por_perfil = _grupos(TABELA_PERFIS_FUNCIONALIDADES, "ID_Perfil", "ID_Funcionalidade",
+                         versao_perfis_funcionalidades)
+    perfis = _grupos(TABELA_USUARIOS_PERFIS, "ID_Usuario", "ID_Perfil", versao_usuarios_perfis)
+    for perfil in perfis.get(usuario_id, ()):
+        ids = ids | por_perfil.get(perfil, frozenset())
+    caminhos = _caminhos_por_funcionalidade(versao_funcionalidades)
+    existentes = ids & caminhos.keys()
+    return Acesso(funcionalidades=existentes, caminhos={caminhos[i] for i in existentes})
 
-    return df.to_dict(orient="records")
 
-#fim    
\ No newline at end of file
+def acesso_usuario() -> Acesso:
+    """Permissões do usuário logado: diretas + perfis (admin → ACESSO_TOTAL)."""
+    usuario = usuario_logado()
+    if not usuario:
+        return SEM_ACESSO
+
+    usuario_id = str(usuario["ID"]).strip()
+    if usuario_id in ADMINS:
+        return ACESSO_TOTAL
+
+    for tabela in _TABELAS_ACESSO:
+        barramento.assinar(tabela)
+    chave = (usuario_id, *(conversa_banco.versao(t) for t in _TABELAS_ACESSO))
+    guardado = st.session_state.get(_CHAVE_ACESSO)
+    if guardado and guardado[0] == chave:
+        return guardado[1]
+
+    acesso = _compilar(*chave)
+    st.session_state[_CHAVE_ACESSO] = (chave, acesso)
+    return acesso
+
+
+def pode_acessar(caminho: str) -> bool:
+    return acesso_usuario().pode_acessar(caminho)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🗂️ Concessão / revogação em lote
+# Diferença entre o atual e o desejado → uma leitura e uma escrita na planilha.
+def _definir_grupos(tabela: str, col_grupo: str, col_item: str, atuais: dict, desejadas: dict) -> tuple[int, int]:
+    """
+    desejadas: {grupo: conjunto de itens} – estado final de cada grupo informado
+    (os demais não mudam). Retorna (inseridas, removidas).
+    """
+    remover, inserir = set(), []
+    for grupo, itens in desejadas.items():
+        grupo = str(grupo).strip()
+        itens = {str(i).strip() for i in itens}
+        tem = atuais.get(grupo, frozenset())
+        remover |= {(grupo, i) for i in tem - itens}
+        inserir += [{col_grupo: grupo, col_item: i} for i in sorted(itens - tem)]
+    removidas, inseridas = conversa_banco.sincronizar_lote(
+        tabela, (col_grupo, col_item), remover, inserir
+    )
+    return inseridas, removidas
+
+
+def definir_permissoes(desejadas: dict) -> tuple[int, int]:
+    """{ID_Usuario: conjunto de ID_Funcionalidade} → (concedidas, revogadas)."""
+    return _definir_grupos(TABELA_PERMISSOES, "ID_Usuario", "ID_Funcionalidade",
+                           permissoes_atuais(), desejadas)
+
+
+def conceder(usuario_id, funcionalidades) -> int:
+    usuario_id = str(usuario_id).strip()
+    atuais = permissoes_atuais().get(usuario_id, frozenset())
+    return definir_permissoes({usuario_id: atuais | {str(f).strip() for f in funcionalidades}})[0]
+
+
+def revogar(usuario_id, funcionalidades) -> int:
+    usuario_id = str(usuario_id).strip()
+    atuais = permissoes_atuais().get(usuario_id, frozenset())
+    return definir_permissoes({usuario_id: atuais - {str(f).strip() for f in funcionalidades}})[1]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 👥 Perfis
+def definir_funcionalidades_perfis(desejadas: dict) -> tuple[int, int]:
+    """{ID_Perfil: conjunto de ID_Funcionalidade} → (concedidas, revogadas)."""
+    garantir_tabelas_perfis()
+    return _definir_grupos(TABELA_PERFIS_FUNCIONALIDADES, "ID_Perfil", "ID_Funcionalidade",
+                           funcionalidades_por_perfil(), desejadas)
+
+
+def definir_perfis_usuarios(desejadas: dict) -> tuple[int, int]:
+    """{ID_Usuario: conjunto de ID_Perfil} → (incluídos, retirados)."""
+    garantir_tabelas_perfis()
+    return _definir_grupos(TABELA_USUARIOS_PERFIS, "ID_Usuario", "ID_Perfil",
+                           perfis_por_usuario(), desejadas)
+
+
+def permissoes_redundantes() -> dict:
+    """{ID_Usuario: permissões diretas que os perfis do usuário já cobrem}"""
+    por_perfil = funcionalidades_por_perfil()
+    perfis = perfis_por_usuario()
+    redundantes = {}
+    for usuario_id, diretas in permissoes_atuais().items():
+        cobertas = frozenset().union(*(por_perfil.get(p, frozenset()) for p in perfis.get(usuario_id, ())))
+        if diretas & cobertas:
+            redundantes[usuario_id] = diretas & cobertas
+    return redundantes
+
+
+def limpar_permissoes_redundantes() -> int:
+    """Remove (num só lote) as permissões diretas já cobertas por perfis."""
+    atuais = permissoes_atuais()
+    desejadas = {u: atuais[u] - r for u, r in permissoes_redundantes().items()}
+    return definir_permissoes(desejadas)[1] if desejadas else 0
+
+#fim
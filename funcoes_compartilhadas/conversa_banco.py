@@ -6,9 +6,12 @@ import pandas as pd
 import gspread
 import streamlit as st
 from functools import wraps
+from gspread.cell import Cell
 from gspread.exceptions import APIError
+from gspread.utils import absolute_range_name
 from google.oauth2.service_account import Credentials
-from funcoes_compartilhadas.cria_id import cria_id
+from funcoes_compartilhadas.cria_id import cria_ids
+from funcoes_compartilhadas import barramento, datas
 
 # ===================================================
 # 🔐 CREDENCIAIS E CONEXÃO COM PLANILHA
@@ -89,6 +92,14 @@ def retry_api_error(func):
         raise APIError("Erro persistente")
     return wrapper
 
+# ===================================================
+# 🔢 VERSÃO DAS TABELAS
+# ===================================================
+# Cada escrita publica no barramento; caches (select, índices) usam a
+# versão da tabela como chave em vez de limpar tudo.
+versao = barramento.versao
+_marca_alteracao = barramento.publicar
+
 # ===================================================
 # 🔧 FUNÇÕES AUXILIARES
 # ===================================================
@@ -104,14 +115,99 @@ def _scale(df: pd.DataFrame, tipos: dict, modo: str) -> pd.DataFrame:
 def _map_cols(df: pd.DataFrame) -> dict:
     return {c.lower(): c for c in df.columns}
 
+def _valor_celula(v):
+    """Converte valores do pandas/numpy para algo que a API aceite."""
+    if isinstance(v, str):
+        return v
+    try:
+        if pd.isna(v):
+            return ""
+    except (TypeError, ValueError):
+        pass
+    if isinstance(v, pd.Timestamp):
+        return v.strftime("%d/%m/%Y %H:%M:%S")
+    if hasattr(v, "item"):
+        return v.item()
+    return v
+
+def _valor_gravar(v, tipo: str | None):
+    """
+    Valor digitado → célula, pelo tipo da coluna (update e update_lote):
+    • numero100: "1.234,56" / "12,5" viram número
+    • data: qualquer formato reconhecido vira DD/MM/AAAA [HH:MM:SS]
+    • demais: texto (1234.0 → "1234")
+    """
+    v = _valor_celula(v)
+    if v == "" or tipo is None:
+        return v
+    if tipo == "numero100":
+        if isinstance(v, str):
+            t = v.strip()
+            if "," in t:
+                t = t.replace(".", "").replace(",", ".")
+            try:
+                return float(t)
+            except ValueError:
+                return v
+        return v
+    if tipo == "data":
+        dt = datas.interpretar_data(v)
+        if dt is None:
+            return v
+        return dt.strftime(datas.FORMATO_DATA_HORA if (dt.hour, dt.minute, dt.second) != (0, 0, 0) else datas.FORMATO_DATA)
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return v if isinstance(v, str) else str(v)
+
+def _tipos_por_coluna(tipos_colunas: dict) -> dict:
+    return {c.lower(): t for c, t in (tipos_colunas or {}).items()}
+
+# ===================================================
+# 🧱 ESTRUTURA
+# ===================================================
+@retry_api_error
+def garantir_tabela(tabela: str, colunas: list) -> bool:
+    """Cria a aba com o cabeçalho, se ainda não existir. Retorna True se criou."""
+    try:
+        _sheet.worksheet(tabela)
+        return False
+    except gspread.WorksheetNotFound:
+        ws = _sheet.add_worksheet(title=tabela, rows=100, cols=max(len(colunas), 1))
+        ws.update("A1", [list(colunas)])
+        _marca_alteracao(tabela)
+        return True
+
 # ===================================================
 # 🟩 SELECT
 # ===================================================
+@st.cache_data(max_entries=64, show_spinner=False)
 @retry_api_error
-def select(tabela: str, tipos_colunas: dict) -> pd.DataFrame:
+def _baixar(tabela: str, versao) -> pd.DataFrame:
     ws = _sheet.worksheet(tabela)
     rows = ws.get_all_records(value_render_option="UNFORMATTED_VALUE")
-    df = pd.DataFrame(rows).rename(columns=str.strip)
+    return pd.DataFrame(rows).rename(columns=str.strip)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _preparar(tabela: str, versao, colunas_data: tuple) -> pd.DataFrame:
+    """Colunas "data" no padrão DD/MM/AAAA [HH:MM:SS]; não reconhecidas em attrs."""
+    df = _baixar(tabela, versao)
+    invalidas = {}
+    for col in colunas_data:
+        if col in df.columns:
+            df[col], inv = datas.normalizar_coluna(df[col])
+            if inv:
+                invalidas[col] = inv
+    df.attrs["datas_invalidas"] = invalidas
+    return df
+
+def select(tabela: str, tipos_colunas: dict) -> pd.DataFrame:
+    """Lê a tabela (cache por versão) e assina a sessão para avisos de alteração."""
+    barramento.assinar(tabela)
+    colunas_data = tuple(c for c, t in tipos_colunas.items() if t == "data")
+    if colunas_data:
+        df = _preparar(tabela, versao(tabela), colunas_data)
+    else:
+        df = _baixar(tabela, versao(tabela))
     if df.empty:
         df = pd.DataFrame(columns=list(tipos_colunas.keys()))
     return _scale(df, tipos_colunas, "mostrar")
@@ -120,30 +216,36 @@ def select(tabela: str, tipos_colunas: dict) -> pd.DataFrame:
 # 🟦 INSERT
 # ===================================================
 @retry_api_error
-def insert(tabela: str, dados):
+def insert(tabela: str, dados) -> int:
+    """Insere uma ou várias linhas com uma única requisição de append."""
     ws = _sheet.worksheet(tabela)
-    if isinstance(dados, pd.DataFrame):
-        dados = dados.to_dict("records")
     if isinstance(dados, dict):
         dados = [dados]
+    df = pd.DataFrame(dados).copy()
+    if df.empty:
+        return 0
 
-    for i, item in enumerate(dados, start=1):
-        if not item.get("ID"):
-            item["ID"] = cria_id(sequencia=str(i))
-
-    df = pd.DataFrame(dados)
-    header = ws.row_values(1) or list(df.columns)
+    # IDs em lote para as linhas que vieram sem ID
+    if "ID" not in df.columns:
+        df.insert(0, "ID", "")
+    sem_id = df["ID"].isna() | (df["ID"].astype(str).str.strip() == "")
+    if sem_id.any():
+        df.loc[sem_id, "ID"] = cria_ids(int(sem_id.sum()))
 
-    if not ws.row_values(1):
+    header = ws.row_values(1)
+    if not header:
+        header = list(df.columns)
         ws.insert_row(header, 1)
     else:
-        for c in df.columns:
-            if c not in header:
-                header.append(c)
-        ws.update("A1", [header])
+        novas = [c for c in df.columns if c not in header]
+        if novas:
+            header += novas
+            ws.update("A1", [header])
 
-    linhas = [[r.get(h, "") for h in header] for r in df.to_dict("records")]
-    ws.insert_rows(linhas, row=len(ws.get_all_values()) + 1)
+    linhas = df.reindex(columns=header).map(_valor_celula).values.tolist()
+    ws.append_rows(linhas, value_input_option="RAW", insert_data_option="INSERT_ROWS", table_range="A1")
+    _marca_alteracao(tabela, "insercao")
+    return len(linhas)
 
 # ===================================================
 # 🟨 UPDATE
@@ -165,10 +267,12 @@ def update(tabela: str, campos: list, valores: list, where: str, tipos_colunas:
     if linhas.empty:
         return 0
 
+    tipos = _tipos_por_coluna(tipos_colunas)
     for lin in linhas:
         for c, v in zip(campos, valores):
             real_c = col_map[c.lower()]
-            ws.update_cell(lin + 2, df.columns.get_loc(real_c) + 1, v)
+            ws.update_cell(lin + 2, df.columns.get_loc(real_c) + 1, _valor_gravar(v, tipos.get(c.lower())))
+    _marca_alteracao(tabela)
     return len(linhas)
 
 # ===================================================
@@ -190,4 +294,356 @@ def delete(tabela: str, where: str, tipos_colunas: dict) -> int:
     linhas = df.index[df[real].astype(str) == str(alvo)]
     for i in sorted(linhas, reverse=True):
         ws.delete_rows(i + 2)
+    if len(linhas):
+        _marca_alteracao(tabela)
     return len(linhas)
+
+# ===================================================
+# 🟧 UPDATE EM LOTE
+# ===================================================
+@retry_api_error
+def update_lote(tabela: str, alteracoes: dict, id_col: str, tipos_colunas: dict) -> int:
+    """
+    Aplica várias alterações com UMA leitura e UMA escrita.
+
+    Parâmetros:
+    - alteracoes (dict): {id: {campo: valor, ...}, ...}
+    - id_col (str): coluna usada para localizar as linhas
+    - tipos_colunas (dict): tipos da tabela; valores convertidos como no update()
+
+    Retorna:
+    - int: quantidade de linhas atualizadas
+    """
+    if not alteracoes:
+        return 0
+
+    ws = _sheet.worksheet(tabela)
+    valores = ws.get_all_values()
+    if len(valores) < 2:
+        return 0
+
+    header = [h.strip() for h in valores[0]]
+    col_map = {h.lower(): i for i, h in enumerate(header)}
+    pos_id = col_map[id_col.lower()]
+
+    # id → linhas da planilha (1 = cabeçalho)
+    linhas_por_id: dict[str, list[int]] = {}
+    for lin, linha in enumerate(valores[1:], start=2):
+        if pos_id < len(linha):
+            linhas_por_id.setdefault(str(linha[pos_id]), []).append(lin)
+
+    tipos = _tipos_por_coluna(tipos_colunas)
+    celulas = []
+    total = 0
+    for id_, campos in alteracoes.items():
+        linhas = linhas_por_id.get(str(id_), [])
+        total += len(linhas)
+        for lin in linhas:
+            for c, v in campos.items():
+                celulas.append(Cell(lin, col_map[c.lower()] + 1, _valor_gravar(v, tipos.get(c.lower()))))
+
+    if celulas:
+        ws.update_cells(celulas, value_input_option="USER_ENTERED")
+        _marca_alteracao(tabela)
+    return total
+
+# ===================================================
+# 🟪 EXCLUIR + INSERIR EM LOTE
+# ===================================================
+def _celula_api(v) -> dict:
+    """Valor → CellData da API (sem interpretação, como RAW)."""
+    v = _valor_celula(v)
+    if isinstance(v, bool):
+        return {"userEnteredValue": {"boolValue": v}}
+    if isinstance(v, (int, float)):
+        return {"userEnteredValue": {"numberValue": v}}
+    return {"userEnteredValue": {"stringValue": str(v)}}
+
+def _faixas_descendentes(linhas) -> list:
+    """Linhas da planilha (1 = cabeçalho) → faixas contíguas [ini, fim), da última para a primeira."""
+    faixas = []
+    for lin in sorted(set(linhas), reverse=True):
+        if faixas and faixas[-1][0] == lin + 1:
+            faixas[-1][0] = lin
+        else:
+            faixas.append([lin, lin + 1])
+    return faixas
+
+def _requisicoes_exclusao(ws, linhas) -> list:
+    """deleteDimension para as linhas da planilha (1 = cabeçalho), de baixo para cima."""
+    return [
+        {"deleteDimension": {"range": {
+            "sheetId": ws.id, "dimension": "ROWS", "startIndex": ini - 1, "endIndex": fim - 1,
+        }}}
+        for ini, fim in _faixas_descendentes(linhas)
+    ]
+
+def _requisicoes_tabela(ws, valores: list, chaves, remover, inserir) -> tuple[list, int, int]:
+    """
+    Requisições de batch_update para uma aba já lida (valores = get_all_values).
+    Remove linhas cujo valor em `chaves` está em `remover`; acrescenta `inserir`
+    (linhas cuja chave já existe – e não está sendo removida – são ignoradas).
+    """
+    header = [h.strip() for h in valores[0]] if valores else []
+    chaves = tuple(chaves)
+    remover = {tuple(str(x).strip() for x in k) for k in remover}
+    requisicoes = []
+
+    novas_colunas = [c for c in chaves if c not in header]
+    for linha in inserir:
+        novas_colunas += [c for c in linha if c not in header and c not in novas_colunas]
+    if novas_colunas and inserir:
+        header = header + [c for c in ["ID"] + novas_colunas if c not in header]
+        requisicoes.append({"updateCells": {
+            "start": {"sheetId": ws.id, "rowIndex": 0, "columnIndex": 0},
+            "rows": [{"values": [_celula_api(h) for h in header]}],
+            "fields": "userEnteredValue",
+        }})
+
+    pos = [header.index(c) if c in header else None for c in chaves]
+
+    def chave(linha):
+        return tuple(
+            str(linha[p]).strip() if p is not None and p < len(linha) else ""
+            for p in pos
+        )
+
+    apagar, existentes = [], set()
+    for lin, linha in enumerate(valores[1:], start=2):
+        k = chave(linha)
+        if k in remover:
+            apagar.append(lin)
+        else:
+            existentes.add(k)
+
+    requisicoes += _requisicoes_exclusao(ws, apagar)
+
+    novas = []
+    for linha in inserir:
+        k = tuple(str(linha.get(c, "")).strip() for c in chaves)
+        if k not in existentes:
+            existentes.add(k)
+            novas.append(dict(linha))
+    if novas:
+        sem_id = [l for l in novas if not str(l.get("ID", "")).strip()]
+        for l, id_ in zip(sem_id, cria_ids(len(sem_id))):
+            l["ID"] = id_
+        requisicoes.append({"appendCells": {
+            "sheetId": ws.id,
+            "rows": [{"values": [_celula_api(l.get(h, "")) for h in header]} for l in novas],
+            "fields": "userEnteredValue",
+        }})
+
+    return requisicoes, len(apagar), len(novas)
+
+@retry_api_error
+def sincronizar_lote(tabela: str, chaves, remover=(), inserir=()) -> tuple[int, int]:
+    """
+    Exclui e insere linhas com UMA leitura e UMA escrita (batch_update).
+
+    Parâmetros:
+    - chaves (tuple): colunas que identificam a linha (ex.: ("ID_Usuario", "ID_Funcionalidade"))
+    - remover (iterável de tuplas): valores de `chaves` das linhas a excluir
+    - inserir (lista de dicts): linhas novas (sem duplicar chaves existentes; ID gerado se faltar)
+
+    Retorna:
+    - (removidas, inseridas)
+    """
+    remover, inserir = list(remover), list(inserir)
+    if not remover and not inserir:
+        return 0, 0
+
+    ws = _sheet.worksheet(tabela)
+    requisicoes, removidas, inseridas = _requisicoes_tabela(ws, ws.get_all_values(), chaves, remover, inserir)
+    if requisicoes:
+        _sheet.batch_update({"requests": requisicoes})
+    if removidas:
+        _marca_alteracao(tabela)
+    elif inseridas:
+        _marca_alteracao(tabela, "insercao")
+    return removidas, inseridas
+
+# ===================================================
+# 🔗 EXCLUSÃO EM CASCATA
+# ===================================================
+# tabela mãe → [(tabela filha, coluna da filha que guarda o ID da mãe)]
+RELACOES = {
+    "menus": [("funcionalidades", "ID_Menu")],
+    "funcionalidades": [
+        ("permissoes", "ID_Funcionalidade"),
+        ("perfis_funcionalidades", "ID_Funcionalidade"),
+    ],
+    "perfis": [
+        ("perfis_funcionalidades", "ID_Perfil"),
+        ("usuarios_perfis", "ID_Perfil"),
+    ],
+}
+
+def _tabelas_relacionadas(tabelas) -> list:
+    """As tabelas informadas e todas as descendentes (mães antes das filhas)."""
+    ordem, pendentes = [], list(tabelas)
+    while pendentes:
+        t = pendentes.pop(0)
+        if t in ordem:
+            continue
+        ordem.append(t)
+        pendentes += [filha for filha, _ in RELACOES.get(t, [])]
+    return ordem
+
+def _ler_varias(tabelas) -> tuple[dict, dict]:
+    """
+    {tabela: worksheet} e {tabela: valores} com UMA leitura (abas inexistentes ficam de fora).
+    Valores não formatados, como no select().
+    """
+    abas = {ws.title: ws for ws in _sheet.worksheets()}
+    existentes = [t for t in tabelas if t in abas]
+    if not existentes:
+        return {}, {}
+    resp = _sheet.values_batch_get(
+        [absolute_range_name(t) for t in existentes],
+        params={"valueRenderOption": "UNFORMATTED_VALUE"},
+    )
+    valores = {t: faixa.get("values", []) for t, faixa in zip(existentes, resp.get("valueRanges", []))}
+    return {t: abas[t] for t in existentes}, valores
+
+def _texto_celula(v) -> str:
+    """Valor não formatado → texto comparável (12.0 → "12")."""
+    if isinstance(v, float) and v.is_integer():
+        v = int(v)
+    return str(v).strip()
+
+def _coluna(valores: list, coluna: str) -> list:
+    """Valores (texto) de `coluna` em cada linha de dados; [] se a coluna não existe."""
+    header = [str(h).strip() for h in valores[0]] if valores else []
+    if coluna not in header:
+        return []
+    pos = header.index(coluna)
+    return [_texto_celula(l[pos]) if pos < len(l) else "" for l in valores[1:]]
+
+def _tem_ids(valores: list) -> bool:
+    """Aba com coluna ID e ao menos uma linha de dados."""
+    return len(valores) > 1 and any(_coluna(valores, "ID"))
+
+def _propagar(valores: dict, apagar: dict) -> dict:
+    """
+    Acrescenta a `apagar` ({tabela: set(linhas)}) as linhas filhas cujo FK aponta
+    para uma linha apagada, até não sobrar dependente.
+    """
+    mudou = True
+    while mudou:
+        mudou = False
+        for mae, filhas in RELACOES.items():
+            if mae not in valores or not apagar.get(mae):
+                continue
+            ids_mae = _coluna(valores[mae], "ID")
+            removidos = {ids_mae[l - 2] for l in apagar[mae] if l - 2 < len(ids_mae)} - {""}
+            for filha, fk in filhas:
+                if filha not in valores:
+                    continue
+                novas = {
+                    lin for lin, v in enumerate(_coluna(valores[filha], fk), start=2)
+                    if v in removidos
+                } - apagar.setdefault(filha, set())
+                if novas:
+                    apagar[filha] |= novas
+                    mudou = True
+    return apagar
+
+def _assinatura_linha(linha: list) -> tuple:
+    """Conteúdo da linha sem as células vazias do fim (a API as omite)."""
+    cel = [_texto_celula(v) for v in linha]
+    while cel and cel[-1] == "":
+        cel.pop()
+    return tuple(cel)
+
+def _revalidar(valores: dict, apagar: dict) -> dict:
+    """
+    Relê as abas e localiza de novo as linhas marcadas, pelo conteúdo completo:
+    se outra sessão excluiu/inseriu linhas depois da leitura, os números mudaram
+    e apagar pelos números antigos removeria as linhas erradas.
+    Aba cujo cabeçalho mudou fica de fora.
+    """
+    alvos = {t: l for t, l in apagar.items() if l}
+    if not alvos:
+        return {}
+    _, atuais = _ler_varias(list(alvos))
+    conferido = {}
+    for t, linhas in alvos.items():
+        antes, agora = valores[t], atuais.get(t, [])
+        if not agora or _assinatura_linha(antes[0]) != _assinatura_linha(agora[0]):
+            continue
+        faltam = {}
+        for lin in linhas:
+            chave = _assinatura_linha(antes[lin - 1])
+            faltam[chave] = faltam.get(chave, 0) + 1
+        achadas = set()
+        for lin, linha in enumerate(agora[1:], start=2):
+            chave = _assinatura_linha(linha)
+            if faltam.get(chave):
+                faltam[chave] -= 1
+                achadas.add(lin)
+        if achadas:
+            conferido[t] = achadas
+    return conferido
+
+def _aplicar_exclusoes(abas: dict, valores: dict, apagar: dict) -> dict:
+    """Confere as linhas e faz um único batch_update (todas as abas). Retorna {tabela: linhas removidas}."""
+    apagar = _revalidar(valores, apagar)
+    requisicoes = []
+    for t, linhas in apagar.items():
+        requisicoes += _requisicoes_exclusao(abas[t], linhas)
+    if requisicoes:
+        _sheet.batch_update({"requests": requisicoes})
+    removidas = {t: len(l) for t, l in apagar.items() if l}
+    for t in removidas:
+        _marca_alteracao(t)
+    return removidas
+
+@retry_api_error
+def excluir_cascata(tabela: str, ids) -> dict:
+    """
+    Exclui as linhas de `tabela` com esses IDs e todas as dependentes (RELACOES),
+    com UMA leitura (mais a releitura de conferência) e UMA escrita para todas
+    as abas envolvidas.
+
+    Retorna:
+    - dict: {tabela: linhas removidas}
+    """
+    ids = {str(i).strip() for i in ids} - {""}
+    if not ids:
+        return {}
+
+    abas, valores = _ler_varias(_tabelas_relacionadas([tabela]))
+    if tabela not in valores:
+        return {}
+    apagar = {tabela: {
+        lin for lin, v in enumerate(_coluna(valores[tabela], "ID"), start=2) if v in ids
+    }}
+    return _aplicar_exclusoes(abas, valores, _propagar(valores, apagar))
+
+@retry_api_error
+def compactar_orfaos() -> dict:
+    """
+    Remove linhas filhas cujo FK (não vazio) aponta para um ID que não existe
+    mais na tabela mãe – e, em cascata, as dependentes delas. Uma leitura, uma
+    releitura de conferência e uma escrita.
+
+    Retorna:
+    - dict: {tabela: linhas removidas}
+    """
+    abas, valores = _ler_varias(_tabelas_relacionadas(list(RELACOES)))
+    apagar = {}
+    for mae, filhas in RELACOES.items():
+        # sem coluna ID ou sem linhas (cabeçalho renomeado, leitura vazia) → não
+        # dá para saber o que é órfão: a relação fica de fora
+        if mae not in valores or not _tem_ids(valores[mae]):
+            continue
+        ids_mae = set(_coluna(valores[mae], "ID"))
+        for filha, fk in filhas:
+            if filha not in valores:
+                continue
+            apagar.setdefault(filha, set()).update(
+                lin for lin, v in enumerate(_coluna(valores[filha], fk), start=2)
+                if v and v not in ids_mae
+            )
+    return _aplicar_exclusoes(abas, valores, _propagar(valores, apagar))
@@ -2,6 +2,13 @@
 import socket
 from datetime import datetime
 
+def _usuario_padrao() -> str:
+    try:
+        return socket.gethostbyname(socket.gethostname()).replace('.', '')
+    except:
+        return '00000000'
+
+
 def cria_id(sequencia='1', usuario=None) -> str:
     """
     Gera um ID no formato:
@@ -17,9 +24,25 @@ def cria_id(sequencia='1', usuario=None) -> str:
     agora = datetime.now().strftime('%Y%m%d_%H%M%S')
 
     if not usuario:
-        try:
-            usuario = socket.gethostbyname(socket.gethostname()).replace('.', '')
-        except:
-            usuario = '00000000'
+        usuario = _usuario_padrao()
 
     return f"{agora}_{usuario}_{sequencia}"
+
+
+def cria_ids(quantidade: int, prefixo='', usuario=None) -> list:
+    """
+    Gera vários IDs de uma vez (mesmo carimbo de data/hora, sequências 1..N).
+
+    Parâmetros:
+    - quantidade (int): quantos IDs gerar
+    - prefixo (str, opcional): texto antes do número da sequência
+    - usuario (str, opcional): se não informado, usa o IP da máquina (sem pontos)
+
+    Retorna:
+    - list[str]: IDs gerados
+    """
+    agora = datetime.now().strftime('%Y%m%d_%H%M%S')
+    if not usuario:
+        usuario = _usuario_padrao()
+    base = f"{agora}_{usuario}_{prefixo}"
+    return [f"{base}{i}" for i in range(1, quantidade + 1)]
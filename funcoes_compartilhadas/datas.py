@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Interpretação de datas em colunas com formatos misturados.
+
+• A planilha mistura DD/MM/AAAA, MM/DD/AAAA, ISO e número de série do Sheets.
+• Cada valor distinto é interpretado uma vez só (memo via factorize).
+• Os formatos são agrupados por padrão e cada grupo vira UMA chamada
+  vetorizada ao pandas.
+• DD/MM x MM/DD é decidido pela própria coluna (valores > 12 em cada posição);
+  sem evidência, vale o padrão brasileiro DD/MM.
+• Os valores que não foram reconhecidos são devolvidos para aviso.
+"""
+
+import re
+from datetime import date, datetime
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+FORMATO_DATA = "%d/%m/%Y"
+FORMATO_DATA_HORA = "%d/%m/%Y %H:%M:%S"
+
+# Número de série do Google Sheets / Excel (dias desde 30/12/1899)
+_ORIGEM_SERIAL = "1899-12-30"
+_SERIAL_MIN, _SERIAL_MAX = 1, 109575  # 1900 … 2199
+
+_BARRA = re.compile(r"^(\d{1,2})/(\d{1,2})/\d{4}(?: \d{1,2}:\d{2}(?::\d{2})?)?$")
+_ISO = re.compile(r"^\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?$")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🔍 INFERÊNCIA DO FORMATO
+# ──────────────────────────────────────────────────────────────────────────────
+def _dia_primeiro(texto: pd.Series) -> bool:
+    """True se a coluna indica DD/MM (ou não há evidência do contrário)."""
+    partes = texto.str.extract(_BARRA).astype(float)
+    votos_dm = int((partes[0] > 12).sum())
+    votos_md = int((partes[1] > 12).sum())
+    return votos_dm >= votos_md
+
+
+def _formatos_barra(dia_primeiro: bool) -> list:
+    dm = ["%d/%m/%Y", "%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M"]
+    md = ["%m/%d/%Y", "%m/%d/%Y %H:%M:%S", "%m/%d/%Y %H:%M"]
+    return dm + md if dia_primeiro else md + dm
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 📅 INTERPRETAÇÃO
+# ──────────────────────────────────────────────────────────────────────────────
+def _interpretar_unicos(unicos: pd.Series, dia_primeiro: bool | None = None) -> pd.Series:
+    """Converte valores distintos; devolve datetime64 (NaT = não reconhecido)."""
+    res = pd.Series(pd.NaT, index=unicos.index, dtype="datetime64[ns]")
+    if unicos.empty:
+        return res
+
+    tipo = unicos.map(type)
+    eh_data = tipo.map(lambda t: issubclass(t, (datetime, date)))
+    eh_num = tipo.map(lambda t: issubclass(t, (int, float, np.integer, np.floating)) and not issubclass(t, bool))
+
+    if eh_data.any():
+        res[eh_data] = pd.to_datetime(unicos[eh_data], errors="coerce")
+
+    if eh_num.any():
+        num = pd.to_numeric(unicos[eh_num], errors="coerce")
+        num = num.where((num >= _SERIAL_MIN) & (num <= _SERIAL_MAX))
+        res[eh_num] = pd.to_datetime(num, unit="D", origin=_ORIGEM_SERIAL, errors="coerce").dt.round("s")
+
+    resto = ~(eh_data | eh_num)
+    texto = unicos[resto].astype(str).str.strip()
+
+    barra = texto[texto.str.match(_BARRA)]
+    if not barra.empty:
+        if dia_primeiro is None:
+            dia_primeiro = _dia_primeiro(barra)
+        falta = barra
+        for fmt in _formatos_barra(dia_primeiro):
+            conv = pd.to_datetime(falta, format=fmt, errors="coerce")
+            res[conv.dropna().index] = conv.dropna()
+            falta = falta[conv.isna()]
+            if falta.empty:
+                break
+
+    iso = texto[texto.str.match(_ISO)]
+    if not iso.empty:
+        res[iso.index] = pd.to_datetime(iso, format="ISO8601", errors="coerce")
+
+    return res
+
+
+def interpretar_coluna(serie: pd.Series, dia_primeiro: bool | None = None) -> tuple[pd.Series, list]:
+    """
+    Converte uma coluna inteira.
+
+    Retorna:
+    - (datas, invalidos): Series datetime64 alinhada à original e a lista de
+      valores preenchidos que não foram reconhecidos.
+    """
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+    unicos = pd.Series(unicos, dtype=object)
+    conv = _interpretar_unicos(unicos, dia_primeiro)
+
+    # último item = NaT → código -1 (vazio) cai nele; funciona mesmo sem nenhum valor único
+    valores = np.append(conv.to_numpy(dtype="datetime64[ns]"), np.datetime64("NaT", "ns"))
+    datas = pd.Series(valores[codigos], index=serie.index, dtype="datetime64[ns]")
+
+    preenchido = unicos.astype(str).str.strip() != ""
+    invalidos = unicos[conv.isna() & preenchido].tolist()
+    return datas, invalidos
+
+
+def para_texto(datas: pd.Series) -> pd.Series:
+    """datetime64 → DD/MM/AAAA (ou DD/MM/AAAA HH:MM:SS quando há hora); NaT → ""."""
+    tem_hora = (datas.dt.hour + datas.dt.minute + datas.dt.second).fillna(0) > 0
+    so_data = datas.dt.strftime(FORMATO_DATA)
+    com_hora = datas.dt.strftime(FORMATO_DATA_HORA)
+    return com_hora.where(tem_hora, so_data).fillna("")
+
+
+def normalizar_coluna(serie: pd.Series) -> tuple[pd.Series, list]:
+    """
+    Coluna de datas em texto no padrão do app (DD/MM/AAAA [HH:MM:SS]).
+    Valores não reconhecidos ficam como vieram.
+    """
+    datas, invalidos = interpretar_coluna(serie)
+    return para_texto(datas).where(datas.notna(), serie), invalidos
+
+
+@lru_cache(maxsize=4096)
+def _interpretar_texto(valor: str) -> datetime | None:
+    dt = _interpretar_unicos(pd.Series([valor], dtype=object), dia_primeiro=True).iloc[0]
+    return None if pd.isna(dt) else dt.to_pydatetime()
+
+
+def interpretar_data(valor) -> datetime | None:
+    """Um valor só (formulários). Memoizado; sem contexto de coluna vale DD/MM."""
+    if valor is None or str(valor).strip() == "":
+        return None
+    if isinstance(valor, (datetime, date, int, float)) and not isinstance(valor, bool):
+        dt = _interpretar_unicos(pd.Series([valor], dtype=object), dia_primeiro=True).iloc[0]
+        return None if pd.isna(dt) else dt.to_pydatetime()
+    return _interpretar_texto(str(valor).strip())
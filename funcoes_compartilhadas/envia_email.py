@@ -1,8 +1,32 @@
 # -*- coding: utf-8 -*-
+"""
+Envio de e-mails.
+
+• FilaEmail: fila em memória com uma thread de envio que reaproveita uma
+  conexão SMTP autenticada (conferida com NOOP, refeita se cair), tenta de
+  novo com espera exponencial e guarda o status de cada mensagem por ID.
+• fila_padrao(): uma fila por processo, com as credenciais do Gmail.
+• enfileirar_email: caminho normal (não bloqueia); enviar_email só por compatibilidade.
+• ConfigSMTP aceita qualquer servidor/porta/TLS → dá para testar com um
+  servidor SMTP local (ex.: python -m aiosmtpd -n -l localhost:1025).
+"""
+
+import time
+import queue
 import smtplib
+import threading
+from uuid import uuid4
+from collections import OrderedDict
 from email.mime.text import MIMEText
 import streamlit as st
 
+# Status de uma mensagem
+PENDENTE = "pendente"
+ENVIANDO = "enviando"
+ENVIADO = "enviado"
+FALHOU = "falhou"
+
+
 def _carregar_credenciais_gmail():
     """
     Carrega credenciais do Gmail.
@@ -21,19 +45,199 @@ def _carregar_credenciais_gmail():
         return USUARIO, SENHA_APP, SMTP_SERVIDOR, SMTP_PORTA
 
 
-def enviar_email(destinatario, assunto, mensagem):
-    remetente, senha, servidor, porta = _carregar_credenciais_gmail()
-    msg = MIMEText(mensagem, "html", "utf-8")
-    msg["Subject"] = assunto
-    msg["From"] = remetente
-    msg["To"] = destinatario
+class ConfigSMTP:
+    """
+    Dados de conexão.
+    tls: "starttls" (padrão), "ssl" (SMTP_SSL) ou None (sem criptografia, só para testes).
+    usuario/senha vazios → sem login.
+    """
+
+    def __init__(self, servidor: str, porta: int, usuario: str = "", senha: str = "",
+                 remetente: str = "", tls: str | None = "starttls", timeout: float = 30):
+        self.servidor = servidor
+        self.porta = int(porta)
+        self.usuario = usuario
+        self.senha = senha
+        self.remetente = remetente or usuario
+        self.tls = tls
+        self.timeout = timeout
 
+
+def config_gmail() -> ConfigSMTP:
+    usuario, senha, servidor, porta = _carregar_credenciais_gmail()
     try:
-        with smtplib.SMTP(servidor, porta) as smtp:
-            smtp.starttls()
-            smtp.login(remetente, senha)
-            smtp.sendmail(remetente, destinatario, msg.as_string())
-        return True
+        tls = st.secrets["gmail"].get("SMTP_TLS", "starttls")
+    except Exception:
+        tls = "starttls"
+    return ConfigSMTP(servidor, porta, usuario, senha, tls=tls or None)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 📬 FILA
+# ──────────────────────────────────────────────────────────────────────────────
+class FilaEmail:
+    def __init__(self, config: ConfigSMTP, max_tentativas: int = 4, espera_inicial: float = 2.0,
+                 ocioso: float = 60.0, historico: int = 1000):
+        self.config = config
+        self.max_tentativas = max_tentativas
+        self.espera_inicial = espera_inicial
+        self.ocioso = ocioso              # s sem mensagens → fecha a conexão
+        self._historico = historico
+        self._fila: queue.Queue = queue.Queue()
+        self._status: OrderedDict[str, dict] = OrderedDict()
+        self._trava = threading.Lock()
+        self._mudou = threading.Condition(self._trava)
+        self._thread: threading.Thread | None = None
+        self._smtp: smtplib.SMTP | None = None
+
+    # ─── API ──────────────────────────────────────────────────
+    def enviar(self, destinatario, assunto: str, mensagem: str, html: bool = True) -> str:
+        """Enfileira a mensagem e devolve o ID (não bloqueia)."""
+        destinatarios = [destinatario] if isinstance(destinatario, str) else list(destinatario)
+        msg = MIMEText(mensagem, "html" if html else "plain", "utf-8")
+        msg["Subject"] = assunto
+        msg["From"] = self.config.remetente
+        msg["To"] = ", ".join(destinatarios)
+
+        id_msg = uuid4().hex
+        with self._trava:
+            self._status[id_msg] = {"status": PENDENTE, "tentativas": 0, "erro": "", "atualizado": time.time()}
+            while len(self._status) > self._historico:
+                self._status.popitem(last=False)
+            self._iniciar()
+        self._fila.put((id_msg, destinatarios, msg.as_string()))
+        return id_msg
+
+    def status(self, id_msg: str) -> dict | None:
+        with self._trava:
+            atual = self._status.get(id_msg)
+            return dict(atual) if atual else None
+
+    def aguardar(self, id_msg: str, timeout: float | None = None) -> dict | None:
+        """Espera a mensagem terminar (enviado/falhou) ou o timeout."""
+        limite = None if timeout is None else time.time() + timeout
+        with self._mudou:
+            while True:
+                atual = self._status.get(id_msg)
+                if not atual or atual["status"] in (ENVIADO, FALHOU):
+                    return dict(atual) if atual else None
+                restante = None if limite is None else limite - time.time()
+                if restante is not None and restante <= 0:
+                    return dict(atual)
+                self._mudou.wait(restante)
+
+    def encerrar(self, timeout: float | None = None) -> None:
+        """Envia o que já está na fila e para a thread."""
+        self._fila.put(None)
+        if self._thread:
+            self._thread.join(timeout)
+
+    # ─── Thread de envio ──────────────────────────────────────
+    def _iniciar(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._trabalhar, name="fila-email", daemon=True)
+            self._thread.start()
+
+    def _marcar(self, id_msg: str, **campos) -> None:
+        with self._mudou:
+            if id_msg in self._status:
+                self._status[id_msg].update(campos, atualizado=time.time())
+            self._mudou.notify_all()
+
+    def _trabalhar(self) -> None:
+        while True:
+            try:
+                item = self._fila.get(timeout=self.ocioso)
+            except queue.Empty:
+                self._desconectar()
+                continue
+            if item is None:
+                self._desconectar()
+                return
+            self._entregar(*item)
+
+    def _entregar(self, id_msg: str, destinatarios: list, conteudo: str) -> None:
+        for tentativa in range(1, self.max_tentativas + 1):
+            self._marcar(id_msg, status=ENVIANDO, tentativas=tentativa)
+            try:
+                self._conexao().sendmail(self.config.remetente, destinatarios, conteudo)
+                self._marcar(id_msg, status=ENVIADO, erro="")
+                return
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused) as e:
+                # recusa definitiva: não adianta tentar de novo
+                self._marcar(id_msg, status=FALHOU, erro=str(e))
+                return
+            except Exception as e:
+                self._desconectar()
+                if tentativa == self.max_tentativas:
+                    self._marcar(id_msg, status=FALHOU, erro=str(e))
+                    return
+                self._marcar(id_msg, erro=str(e))
+                time.sleep(self.espera_inicial * 2 ** (tentativa - 1))
+
+    # ─── Conexão reaproveitada ────────────────────────────────
+    def _conexao(self) -> smtplib.SMTP:
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except Exception:
+                pass
+            self._desconectar()
+
+        c = self.config
+        if c.tls == "ssl":
+            smtp = smtplib.SMTP_SSL(c.servidor, c.porta, timeout=c.timeout)
+        else:
+            smtp = smtplib.SMTP(c.servidor, c.porta, timeout=c.timeout)
+            if c.tls == "starttls":
+                smtp.starttls()
+        if c.usuario and c.senha:
+            smtp.login(c.usuario, c.senha)
+        self._smtp = smtp
+        return smtp
+
+    def _desconectar(self) -> None:
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except Exception:
+            try:
+                self._smtp.close()
+            except Exception:
+                pass
+        self._smtp = None
+
+
+@st.cache_resource(show_spinner=False)
+def fila_padrao() -> FilaEmail:
+    """Fila do processo (credenciais do Gmail)."""
+    return FilaEmail(config_gmail())
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# ✉️ ATALHOS
+# ──────────────────────────────────────────────────────────────────────────────
+def enfileirar_email(destinatario, assunto, mensagem) -> str:
+    """Não bloqueia: devolve o ID para consultar fila_padrao().status(id)."""
+    return fila_padrao().enviar(destinatario, assunto, mensagem)
+
+
+def enviar_email(destinatario, assunto, mensagem, timeout: float = 60):
+    """
+    Só compatibilidade: BLOQUEIA o script até o envio terminar (ou o timeout)
+    e devolve True/False, como a versão antiga. Em telas, use enfileirar_email
+    e mostre fila_padrao().status(id).
+    """
+    try:
+        fila = fila_padrao()
+        resultado = fila.aguardar(fila.enviar(destinatario, assunto, mensagem), timeout)
     except Exception as e:
         st.error(f"❌ Erro ao enviar e-mail: {e}")
         return False
+    if resultado and resultado["status"] == ENVIADO:
+        return True
+    erro = resultado["erro"] if resultado else ""
+    st.error(f"❌ Erro ao enviar e-mail: {erro or 'tempo esgotado'}")
+    return False
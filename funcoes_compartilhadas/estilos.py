@@ -6,9 +6,16 @@ Estilo global:
 • Título sticky
 • Responsividade dos botões e colunas
 • Mantém Material Icons nos ícones da sidebar
+
+Todo o CSS do app (global, menu lateral, login, botão Sair) forma um único
+pacote versionado, gravado no <head> da página uma vez por sessão por um
+script que também remove versões antigas: reruns não reenviam CSS nem iframe.
 """
 
+import json
+import hashlib
 import streamlit as st
+import streamlit.components.v1 as components
 from math import ceil
 
 # ─── 1. Controles ────────────────────────────────────────────────
@@ -26,13 +33,12 @@ FONTES = {
 }
 
 # ─── 2. CSS global ───────────────────────────────────────────────
-def aplicar_estilo_padrao() -> None:
-    st.markdown(
-f"""
-<link href="https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-<link href="https://fonts.googleapis.com/icon?family=Material+Icons" rel="stylesheet">
+FONTES_EXTERNAS = [
+    "https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap",
+    "https://fonts.googleapis.com/icon?family=Material+Icons",
+]
 
-<style>
+CSS_GLOBAL = f"""
 /* Aplica Poppins em tudo, EXCETO nos ícones */
 *:not([data-testid="stIconMaterial"]):not(.material-icons) {{
     font-family: 'Poppins', sans-serif !important;
@@ -109,14 +115,146 @@ div[data-testid="stHorizontalBlock"] {{
         width: 100% !important;
     }}
 }}
-</style>
-""",
-        unsafe_allow_html=True,
-    )
+"""
+
+# Menu lateral: radio em coluna, rótulos alinhados
+CSS_MENU = """
+[data-testid="stSidebar"] .stRadio > div {
+    flex-direction: column;
+    gap: 0.3rem;
+}
+[data-testid="stSidebar"] label {
+    align-items: center;
+    display: flex;
+    gap: 0.5rem;
+    word-break: break-word;
+}
+"""
+
+# Tela de login (só dentro de st.container(key="login"))
+CSS_LOGIN = """
+.st-key-login div[data-testid="stTextInput"] > div:first-child {
+    position: relative !important;
+}
+.st-key-login div[data-testid="stTextInput"] svg {
+    position: absolute !important;
+    right: 12px !important;
+    top: 2.5em !important;
+    transform: none !important;
+    z-index: 2;
+    pointer-events: none;
+}
+.st-key-login input[type="password"] {
+    padding-right: 2.5rem !important;
+}
+.st-key-login div[data-testid="stButton"] > button {
+    display: block;
+    margin: 0 auto;
+    background-color:#4CAF50;
+    color:#ffffff;
+    font-size:14px;
+    padding:6px 20px;
+    border:none;
+    border-radius:5px;
+    transition: background-color 0.2s ease;
+}
+.st-key-login div[data-testid="stButton"] > button:hover {
+    background-color: #388E3C;
+    color: white;
+}
+.st-key-login div[data-testid="stPopoverContainer"] > button {
+    display: block;
+    margin-left: auto;
+    margin-right: auto;
+}
+a.link-esqueci:link,
+a.link-esqueci:visited {
+    text-decoration: none;
+    color: #777 !important;
+    font-size: 12px;
+    font-weight: normal;
+}
+a.link-esqueci:hover {
+    color: #1976D2 !important;
+    font-weight: bold;
+}
+"""
+
+# Botão Sair da sidebar (st.container(key="sair"))
+CSS_SAIR = """
+.st-key-sair .stButton {
+    display: flex; justify-content: center;
+}
+.st-key-sair .stButton button {
+    background-color:#e0e0e0;color:#333;font-size:14px;
+    padding:6px 20px;border:none;border-radius:5px;
+}
+.st-key-sair .stButton button:hover {
+    background-color:#f44336;color:white;
+}
+header[data-testid="stHeader"] div[role="button"]{display:none!important;}
+"""
+
+CSS_PACOTE = "\n".join([CSS_GLOBAL, CSS_MENU, CSS_LOGIN, CSS_SAIR])
+VERSAO_ESTILO = hashlib.sha1((CSS_PACOTE + "".join(FONTES_EXTERNAS)).encode()).hexdigest()[:10]
+
+
+# ─── 3. Injeção (uma vez por sessão) ─────────────────────────────
+_CHAVE_SESSAO = "_estilo_aplicado"
+
+_SCRIPT = """
+<script>
+  const doc = parent.document;
+  const versao = __VERSAO__;
+  if (!doc.getElementById("estilo-app-" + versao)) {
+    doc.querySelectorAll("[data-estilo-app]").forEach(el => el.remove());
+    for (const href of __FONTES__) {
+      const link = doc.createElement("link");
+      link.rel = "stylesheet";
+      link.href = href;
+      link.dataset.estiloApp = versao;
+      doc.head.appendChild(link);
+    }
+    const style = doc.createElement("style");
+    style.id = "estilo-app-" + versao;
+    style.dataset.estiloApp = versao;
+    style.textContent = __CSS__;
+    doc.head.appendChild(style);
+  }
+  const root = doc.documentElement;
+  root.setAttribute("lang", "pt-BR");
+  root.setAttribute("translate", "no");
+  if (!doc.querySelector('meta[name="google"]')) {
+    const meta = doc.createElement("meta");
+    meta.name    = "google";
+    meta.content = "notranslate";
+    doc.head.appendChild(meta);
+  }
+</script>
+"""
+
+
+def _js(valor) -> str:
+    return json.dumps(valor).replace("</", "<\\/")
+
+
+SCRIPT_PACOTE = (
+    _SCRIPT.replace("__VERSAO__", _js(VERSAO_ESTILO))
+    .replace("__FONTES__", _js(FONTES_EXTERNAS))
+    .replace("__CSS__", _js(CSS_PACOTE))
+)
+
+
+def aplicar_estilo_padrao() -> None:
+    """Grava o pacote de estilo no <head> – só na primeira execução da sessão."""
+    if st.session_state.get(_CHAVE_SESSAO) == VERSAO_ESTILO:
+        return
+    components.html(SCRIPT_PACOTE, height=0)
+    st.session_state[_CHAVE_SESSAO] = VERSAO_ESTILO
 
 
 
-# ─── 3. Utilitários ───────────────────────────────────────────────
+# ─── 4. Utilitários ───────────────────────────────────────────────
 def set_page_title(texto: str) -> None:
     st.markdown(
         f"<div id='page-title-wrapper'><h1>{texto}</h1></div>",
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Formatação de colunas inteiras para exibição (vetorizado, sem loop por célula).
+
+• CPF       → 000.000.000-00 (CPF numérico recupera os zeros à esquerda)
+• Celular   → (99) 99999-9999 / (99) 9999-9999
+• Data      → DD/MM/YYYY HH:mm:ss
+• formatar: aplica os formatos a um recorte (ex.: as linhas encontradas na busca).
+"""
+
+import pandas as pd
+from funcoes_compartilhadas import datas
+from funcoes_compartilhadas.indice_documentos import cpf_serie, so_digitos_serie
+
+
+def _texto(serie: pd.Series) -> pd.Series:
+    return serie.fillna("").astype(str)
+
+
+def formatar_cpf(serie: pd.Series) -> pd.Series:
+    """CPF (mesma chave de indice_documentos) vira 000.000.000-00; o resto fica como veio."""
+    dig = cpf_serie(serie)
+    fmt = dig.str.replace(r"^(\d{3})(\d{3})(\d{3})(\d{2})$", r"\1.\2.\3-\4", regex=True)
+    return fmt.where(dig.str.len() == 11, _texto(serie))
+
+
+def formatar_celular(serie: pd.Series) -> pd.Series:
+    """11 dígitos → (99) 99999-9999; 10 dígitos → (99) 9999-9999."""
+    dig = so_digitos_serie(serie)
+    tam = dig.str.len()
+    fmt11 = dig.str.replace(r"^(\d{2})(\d{5})(\d{4})$", r"(\1) \2-\3", regex=True)
+    fmt10 = dig.str.replace(r"^(\d{2})(\d{4})(\d{4})$", r"(\1) \2-\3", regex=True)
+    return fmt11.where(tam == 11, fmt10.where(tam == 10, _texto(serie)))
+
+
+def formatar_data_br(serie: pd.Series) -> pd.Series:
+    """Qualquer formato reconhecido → DD/MM/YYYY HH:mm:ss ("-" se não reconhecer)."""
+    convertidas, _ = datas.interpretar_coluna(serie)
+    return convertidas.dt.strftime(datas.FORMATO_DATA_HORA).fillna("-")
+
+
+FORMATADORES = {
+    "cpf": formatar_cpf,
+    "celular": formatar_celular,
+    "data_br": formatar_data_br,
+}
+
+
+def formatar(df: pd.DataFrame, formatos: dict) -> pd.DataFrame:
+    """Cópia de `df` com os formatos aplicados – custo proporcional às linhas recebidas."""
+    df = df.copy()
+    for col, formato in formatos.items():
+        if col in df.columns:
+            df[col] = FORMATADORES[formato](df[col])
+    return df
+
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Importação em massa (CSV / Excel) para qualquer tabela do banco.
+
+• Lê o arquivo em blocos, sem carregar tudo na memória.
+• Valida e converte os tipos de cada bloco de forma vetorizada (tipos_colunas).
+• Gera os IDs do bloco de uma vez e grava com um único append por bloco.
+• Informa o progresso por callback e devolve a linha onde parar/retomar.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Callable, Iterator
+from funcoes_compartilhadas import conversa_banco, datas
+from funcoes_compartilhadas.cria_id import cria_ids
+from funcoes_compartilhadas.controle_acesso import hash_senha
+
+TAMANHO_BLOCO = 2000
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 📂 LEITURA EM BLOCOS
+# ──────────────────────────────────────────────────────────────────────────────
+def _eh_excel(nome: str) -> bool:
+    return nome.lower().endswith((".xlsx", ".xlsm"))
+
+
+def _blocos_excel(arquivo, tamanho: int) -> Iterator[pd.DataFrame]:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(arquivo, read_only=True, data_only=True)
+    try:
+        linhas = wb.active.iter_rows(values_only=True)
+        header = [str(h).strip() if h is not None else "" for h in next(linhas, ())]
+        largura = len(header)
+        bloco = []
+        for lin in linhas:
+            if all(v is None for v in lin):
+                continue
+            bloco.append((tuple(lin) + (None,) * largura)[:largura])
+            if len(bloco) == tamanho:
+                yield pd.DataFrame(bloco, columns=header)
+                bloco = []
+        if bloco:
+            yield pd.DataFrame(bloco, columns=header)
+    finally:
+        wb.close()
+
+
+def _blocos_csv(arquivo, tamanho: int) -> Iterator[pd.DataFrame]:
+    # sep=None → detecta "," ou ";" (planilhas exportadas no Brasil usam ";")
+    for bloco in pd.read_csv(arquivo, sep=None, engine="python", dtype=str,
+                             encoding="utf-8-sig", chunksize=tamanho):
+        yield bloco.rename(columns=str.strip)
+
+
+def ler_blocos(arquivo, nome: str, tamanho: int = TAMANHO_BLOCO) -> Iterator[pd.DataFrame]:
+    """Gera DataFrames de até `tamanho` linhas a partir de um CSV ou XLSX."""
+    if hasattr(arquivo, "seek"):
+        arquivo.seek(0)
+    if _eh_excel(nome):
+        yield from _blocos_excel(arquivo, tamanho)
+    else:
+        yield from _blocos_csv(arquivo, tamanho)
+
+
+def contar_linhas(arquivo, nome: str) -> int | None:
+    """Total aproximado de linhas de dados (para a barra de progresso)."""
+    try:
+        if _eh_excel(nome):
+            from openpyxl import load_workbook
+            arquivo.seek(0)
+            wb = load_workbook(arquivo, read_only=True)
+            total = (wb.active.max_row or 1) - 1
+            wb.close()
+            return total
+        arquivo.seek(0)
+        total = sum(bloco.count(b"\n") for bloco in iter(lambda: arquivo.read(1 << 20), b""))
+        return max(total - 1, 0)
+    except Exception:
+        return None
+    finally:
+        if hasattr(arquivo, "seek"):
+            arquivo.seek(0)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🔎 VALIDAÇÃO / CONVERSÃO
+# ──────────────────────────────────────────────────────────────────────────────
+def _vazio(serie: pd.Series) -> pd.Series:
+    return serie.isna() | (serie.astype(str).str.strip() == "")
+
+
+def _converter_numero(serie: pd.Series) -> pd.Series:
+    texto = serie.astype(str).str.strip()
+    # "1.234,56" → "1234.56"; "1234.56" fica como está
+    br = texto.str.contains(",", regex=False)
+    texto = pd.Series(
+        np.where(br, texto.str.replace(".", "", regex=False).str.replace(",", ".", regex=False), texto),
+        index=serie.index,
+    )
+    return pd.to_numeric(texto, errors="coerce")
+
+
+def _converter_data(serie: pd.Series) -> pd.Series:
+    convertidas, _ = datas.interpretar_coluna(serie)
+    return datas.para_texto(convertidas).where(convertidas.notna())
+
+
+def converter(df: pd.DataFrame, tipos_colunas: dict) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Ajusta o bloco às colunas/tipos da tabela.
+    Tipo "senha": não pode ficar em branco; gravada como hash (controle_acesso.hash_senha).
+
+    Retorna:
+    - (df_ok, df_rejeitado): linhas válidas e linhas com erro (coluna "_erro")
+    """
+    saida = pd.DataFrame(index=df.index)
+    erro = pd.Series("", index=df.index)
+
+    for col, tipo in tipos_colunas.items():
+        if col not in df.columns:
+            saida[col] = ""
+            continue
+        serie = df[col]
+        vazio = _vazio(serie)
+
+        if tipo == "senha":
+            erro = erro.where(~vazio, erro + f"{col} em branco; ")
+            saida[col] = serie.where(~vazio, "").astype(str).str.strip().map(
+                lambda s: hash_senha(s) if s else ""
+            )
+            continue
+        if tipo == "numero100":
+            conv = _converter_numero(serie)
+        elif tipo == "data":
+            conv = _converter_data(serie)
+        else:
+            saida[col] = serie.where(~vazio, "").astype(str).str.strip()
+            continue
+
+        falhou = conv.isna() & ~vazio
+        erro = erro.where(~falhou, erro + f"{col} inválido; ")
+        saida[col] = conv.astype(object).where(~conv.isna(), "")
+
+    ruins = erro != ""
+    rejeitado = df[ruins].copy()
+    rejeitado["_erro"] = erro[ruins]
+    return saida[~ruins].copy(), rejeitado
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 📥 IMPORTAÇÃO
+# ──────────────────────────────────────────────────────────────────────────────
+def importar(tabela: str, arquivo, nome: str, tipos_colunas: dict,
+             inicio: int = 0, tamanho_bloco: int = TAMANHO_BLOCO,
+             progresso: Callable[[int], None] | None = None,
+             filtro: Callable[[pd.DataFrame], tuple] | None = None,
+             padroes: dict | None = None) -> dict:
+    """
+    Importa o arquivo para `tabela`, bloco a bloco.
+
+    Parâmetros:
+    - inicio (int): linhas de dados já importadas (para retomar após falha)
+    - progresso (callable): recebe o total de linhas processadas até agora
+    - filtro (callable): recebe o bloco convertido e devolve (ok, rejeitado),
+      ex.: indice_documentos.filtro_duplicados
+    - padroes (dict): {coluna: valor} para células vazias; valor chamável é
+      avaliado uma vez no início (ex.: data/hora da importação)
+
+    Retorna:
+    - dict: importadas, rejeitadas (DataFrame), proxima_linha, erro (str | None)
+    """
+    importadas = 0
+    rejeitadas = []
+    lidas = 0
+    padroes = {c: (v() if callable(v) else v) for c, v in (padroes or {}).items()}
+
+    for bloco in ler_blocos(arquivo, nome, tamanho_bloco):
+        ini_bloco = lidas
+        lidas += len(bloco)
+        if lidas <= inicio:
+            continue
+        if ini_bloco < inicio:
+            bloco = bloco.iloc[inicio - ini_bloco:]
+            ini_bloco = inicio
+
+        ok, ruins = converter(bloco, tipos_colunas)
+        if not ruins.empty:
+            rejeitadas.append(ruins)
+        for col, valor in padroes.items():
+            if col in ok.columns:
+                ok.loc[_vazio(ok[col]), col] = valor
+        if filtro and not ok.empty:
+            ok, ruins = filtro(ok)
+            if not ruins.empty:
+                rejeitadas.append(ruins)
+
+        if not ok.empty:
+            sem_id = _vazio(ok["ID"]) if "ID" in ok.columns else pd.Series(True, index=ok.index)
+            if sem_id.any():
+                # prefixo com a linha inicial: IDs únicos mesmo entre blocos do mesmo segundo
+                ok.loc[sem_id, "ID"] = cria_ids(int(sem_id.sum()), prefixo=f"imp{ini_bloco}_")
+            try:
+                conversa_banco.insert(tabela, ok)
+            except Exception as e:
+                return {
+                    "importadas": importadas,
+                    "rejeitadas": pd.concat(rejeitadas) if rejeitadas else pd.DataFrame(),
+                    "proxima_linha": ini_bloco,
+                    "erro": str(e),
+                }
+            importadas += len(ok)
+
+        if progresso:
+            progresso(lidas)
+
+    return {
+        "importadas": importadas,
+        "rejeitadas": pd.concat(rejeitadas) if rejeitadas else pd.DataFrame(),
+        "proxima_linha": lidas,
+        "erro": None,
+    }
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Índice de busca em memória para as tabelas.
+
+• Texto normalizado: minúsculas e sem acentos ("José" == "jose").
+• Busca por palavra inteira ou prefixo de palavra, em um ou vários campos.
+• Resultado ordenado pela qualidade do casamento (palavra exata > prefixo).
+• Colunas de documento (ex.: CPF) também indexam a chave de indice_documentos
+  (CPF numérico 1234567890 → "01234567890"): busca e checagem de duplicado
+  enxergam o mesmo valor.
+• Construído uma vez por versão da tabela e reaproveitado entre reruns.
+"""
+
+import re
+import unicodedata
+import numpy as np
+import pandas as pd
+import streamlit as st
+from typing import Dict, List
+from funcoes_compartilhadas.indice_documentos import GRUPOS_CLIENTES, NORMALIZADORES
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_SO_NUMEROS = re.compile(r"[\d\s.\-()/+]+")
+_FIM = "\uffff"
+
+PONTOS_EXATO = 3.0
+PONTOS_PREFIXO = 1.0
+
+# coluna → grupo de indice_documentos cuja chave normalizada também é indexada
+DOCUMENTOS = {c: g for g, colunas in GRUPOS_CLIENTES.items() if g in NORMALIZADORES for c in colunas}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🔤 NORMALIZAÇÃO
+# ──────────────────────────────────────────────────────────────────────────────
+def normalizar(texto) -> str:
+    """Minúsculas e sem acentos (valor único)."""
+    t = unicodedata.normalize("NFKD", str(texto).lower())
+    return t.encode("ascii", "ignore").decode("ascii")
+
+
+def normalizar_serie(serie: pd.Series) -> pd.Series:
+    """Minúsculas e sem acentos (coluna inteira, vetorizado)."""
+    return (
+        serie.fillna("").astype(str).str.lower()
+        .str.normalize("NFKD")
+        .str.encode("ascii", "ignore")
+        .str.decode("ascii")
+    )
+
+
+def termos(texto) -> List[str]:
+    """
+    Quebra o texto digitado em palavras normalizadas.
+    Só números e pontuação ("123.456-7", "(11) 9876") viram um termo único
+    compacto, que casa com o valor compacto indexado de CPF/telefone.
+    """
+    texto = normalizar(texto)
+    if _SO_NUMEROS.fullmatch(texto) and any(c.isdigit() for c in texto):
+        return ["".join(c for c in texto if c.isdigit())]
+    return _TOKEN.findall(texto)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 📚 ÍNDICE
+# ──────────────────────────────────────────────────────────────────────────────
+class IndiceBusca:
+    """
+    Índice invertido por coluna: vetor ordenado de palavras + posição da linha.
+    Prefixos viram um intervalo no vetor ordenado (busca binária).
+    """
+
+    def __init__(self, df: pd.DataFrame, campos: List[str], documentos: Dict[str, str] | None = None):
+        self.n = len(df)
+        documentos = DOCUMENTOS if documentos is None else documentos
+        self._colunas: Dict[str, tuple] = {}
+        for campo in campos:
+            norm = normalizar_serie(df[campo]).reset_index(drop=True)
+            palavras = norm.str.findall(_TOKEN.pattern)
+
+            # valor compacto ("123.456.789-00" → "12345678900") para campos com várias partes
+            compacto = norm.str.replace(r"[^a-z0-9]", "", regex=True)
+            compacto = compacto[(palavras.str.len() > 1) & (compacto != "")]
+            if campo in documentos:
+                chave = NORMALIZADORES[documentos[campo]][1](df[campo]).reset_index(drop=True)
+                compacto = pd.concat([compacto, chave[chave != ""]])
+
+            ex = pd.concat([palavras.explode().dropna(), compacto])
+            pares = pd.DataFrame({"tok": ex.values.astype(str), "pos": ex.index.values})
+            pares = pares.drop_duplicates().sort_values("tok", kind="stable")
+            self._colunas[campo] = (
+                pares["tok"].to_numpy(dtype=object),
+                pares["pos"].to_numpy(dtype=np.int64),
+            )
+
+    def _pontuar(self, termo: str, campos: List[str]) -> np.ndarray:
+        """Pontos de cada linha para um termo (melhor casamento entre os campos)."""
+        pontos = np.zeros(self.n)
+        for campo in campos:
+            toks, pos = self._colunas[campo]
+            ini = np.searchsorted(toks, termo, side="left")
+            fim_exato = np.searchsorted(toks, termo, side="right")
+            fim = np.searchsorted(toks, termo + _FIM, side="left")
+            np.maximum.at(pontos, pos[ini:fim], PONTOS_PREFIXO)
+            np.maximum.at(pontos, pos[ini:fim_exato], PONTOS_EXATO)
+        return pontos
+
+    def _ordenar(self, grupos: List[np.ndarray], limite: int | None) -> np.ndarray:
+        """Todas as condições precisam casar; ordena pela soma dos pontos."""
+        if not grupos:
+            return np.arange(self.n)
+        total = np.zeros(self.n)
+        ok = np.ones(self.n, dtype=bool)
+        for pontos in grupos:
+            ok &= pontos > 0
+            total += pontos
+        idx = np.flatnonzero(ok)
+        idx = idx[np.argsort(-total[idx], kind="stable")]
+        return idx[:limite] if limite else idx
+
+    def buscar(self, consultas: Dict[str, str], limite: int | None = None) -> np.ndarray:
+        """
+        Busca campo a campo: {"Nome": "jo sil", "Cidade": "sao"}.
+        Retorna as posições das linhas (ordem = melhor casamento primeiro).
+        """
+        grupos = [
+            self._pontuar(t, [campo])
+            for campo, texto in consultas.items() if texto
+            for t in termos(texto)
+        ]
+        return self._ordenar(grupos, limite)
+
+    def buscar_texto(self, texto: str, campos: List[str] | None = None, limite: int | None = None) -> np.ndarray:
+        """Busca livre: cada palavra digitada pode casar em qualquer um dos campos."""
+        campos = campos or list(self._colunas)
+        grupos = [self._pontuar(t, campos) for t in termos(texto)]
+        return self._ordenar(grupos, limite)
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _indice_cache(chave: str, versao, campos: tuple, impressao: tuple, _df: pd.DataFrame) -> IndiceBusca:
+    return IndiceBusca(_df, list(campos))
+
+
+def _impressao(df: pd.DataFrame, id_col: str = "ID") -> tuple:
+    """
+    (linhas, hash das posições do índice e da coluna ID): frame filtrado ou
+    reordenado com a mesma chave/versão não reaproveita o índice de outro.
+    """
+    base = df[[id_col]] if id_col in df.columns else df.iloc[:, :0]
+    h = pd.util.hash_pandas_object(base, index=True).to_numpy()
+    pesos = np.arange(1, len(h) + 1, dtype=np.uint64)
+    return len(df), int((h * pesos).sum())
+
+
+def indice(df: pd.DataFrame, campos: List[str], chave: str, versao=None) -> IndiceBusca:
+    """
+    Índice em cache para `df`.
+    • versao: versão da tabela (conversa_banco.versao). Sem ela, usa o hash do conteúdo.
+    """
+    if versao is None:
+        versao = int(pd.util.hash_pandas_object(df[campos], index=True).sum())
+    return _indice_cache(chave, versao, tuple(campos), _impressao(df), df)
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Índice hash de documentos/telefones normalizados (só dígitos).
+
+• "123.456.789-00", "12345678900" e " 123 456 789 00 " viram a mesma chave.
+• CPF gravado como número perde o zero à esquerda (01234567890 → 1234567890):
+  chaves de CPF são completadas com zeros até 11 dígitos.
+• Busca O(1) de clientes por CPF ou telefone.
+• Detecção de CPF duplicado no cadastro e na importação em massa.
+• Reconstruído (vetorizado) a cada nova versão da tabela.
+"""
+
+import re
+import pandas as pd
+import streamlit as st
+from typing import Callable, Dict, List
+
+# grupo → colunas cujas chaves são comparadas entre si
+GRUPOS_CLIENTES = {
+    "cpf": ["CPF"],
+    "telefone": ["celular", "celular1"],
+}
+
+_NAO_DIGITO = re.compile(r"\D")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🔢 NORMALIZAÇÃO
+# ──────────────────────────────────────────────────────────────────────────────
+def _texto(valor) -> str:
+    # 1234567890.0 (coluna numérica com vazios) → "1234567890"
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return str(valor)
+
+
+def so_digitos(valor) -> str:
+    if valor is None or (isinstance(valor, float) and pd.isna(valor)):
+        return ""
+    return _NAO_DIGITO.sub("", _texto(valor))
+
+
+def so_digitos_serie(serie: pd.Series) -> pd.Series:
+    return serie.fillna("").map(_texto).str.replace(r"\D", "", regex=True)
+
+
+def cpf(valor) -> str:
+    """Dígitos do CPF com 11 posições ("" se vazio)."""
+    d = so_digitos(valor)
+    return d.zfill(11) if d else ""
+
+
+def cpf_serie(serie: pd.Series) -> pd.Series:
+    d = so_digitos_serie(serie)
+    return d.where(d == "", d.str.zfill(11))
+
+
+# grupo → (normaliza um valor, normaliza uma Series); padrão: só dígitos
+NORMALIZADORES = {
+    "cpf": (cpf, cpf_serie),
+}
+
+
+def _normalizadores(grupo: str):
+    return NORMALIZADORES.get(grupo, (so_digitos, so_digitos_serie))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 📇 ÍNDICE
+# ──────────────────────────────────────────────────────────────────────────────
+class IndiceDocumentos:
+    """{grupo: {dígitos: (ids...)}}"""
+
+    def __init__(self, df: pd.DataFrame, grupos: Dict[str, List[str]], id_col: str = "ID"):
+        self._mapas: Dict[str, dict] = {}
+        ids = df[id_col].astype(str) if id_col in df.columns else pd.Series("", index=df.index)
+        for grupo, campos in grupos.items():
+            normalizar = _normalizadores(grupo)[1]
+            partes = [
+                pd.DataFrame({"chave": normalizar(df[c]), "id": ids})
+                for c in campos if c in df.columns
+            ]
+            if not partes:
+                self._mapas[grupo] = {}
+                continue
+            tudo = pd.concat(partes)
+            tudo = tudo[tudo["chave"] != ""].drop_duplicates()
+            self._mapas[grupo] = tudo.groupby("chave", sort=False)["id"].agg(tuple).to_dict()
+
+    def buscar(self, grupo: str, valor) -> tuple:
+        """IDs com o mesmo documento/telefone (vazio se não houver)."""
+        return self._mapas[grupo].get(_normalizadores(grupo)[0](valor), ())
+
+    def chaves(self, grupo: str) -> set:
+        return set(self._mapas[grupo])
+
+    def duplicado(self, grupo: str, valor, id_atual=None) -> tuple:
+        """IDs de OUTROS registros que já usam `valor`."""
+        return tuple(i for i in self.buscar(grupo, valor) if i != str(id_atual))
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _indice_cache(tabela: str, versao, grupos: tuple, _df: pd.DataFrame) -> IndiceDocumentos:
+    return IndiceDocumentos(_df, {g: list(c) for g, c in grupos})
+
+
+def indice(df: pd.DataFrame, tabela: str, versao, grupos: Dict[str, List[str]] = GRUPOS_CLIENTES) -> IndiceDocumentos:
+    """Índice em cache para a versão atual da tabela (conversa_banco.versao)."""
+    return _indice_cache(tabela, versao, tuple((g, tuple(c)) for g, c in grupos.items()), df)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🚫 DUPLICADOS NA IMPORTAÇÃO
+# ──────────────────────────────────────────────────────────────────────────────
+def filtro_unicos(vistos: set, campo: str,
+                  normalizar: Callable[[pd.Series], pd.Series] = so_digitos_serie) -> Callable:
+    """
+    Filtro para importa_dados.importar: rejeita linhas cuja chave (campo
+    normalizado) já está em `vistos`, apareceu num bloco anterior ou se repete
+    dentro do próprio bloco. `vistos` é atualizado a cada bloco.
+    """
+    vistos = set(vistos)
+
+    def filtro(bloco: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+        if campo not in bloco.columns:
+            return bloco, bloco.iloc[0:0]
+        chaves = normalizar(bloco[campo])
+        preenchido = chaves != ""
+        dup = preenchido & (chaves.isin(vistos) | chaves.duplicated())
+        vistos.update(chaves[preenchido & ~dup])
+        rejeitado = bloco[dup].copy()
+        rejeitado["_erro"] = f"{campo} duplicado; "
+        return bloco[~dup].copy(), rejeitado
+
+    return filtro
+
+
+def filtro_duplicados(indice_atual: IndiceDocumentos, campo: str = "CPF", grupo: str = "cpf") -> Callable:
+    """Rejeita documentos (ex.: CPF) que já existem na tabela ou se repetem no arquivo."""
+    return filtro_unicos(indice_atual.chaves(grupo), campo, _normalizadores(grupo)[1])
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Migrações / correções de dados que rodam uma única vez.
+
+• Cada migração é uma função que corrige a planilha em lote (1 leitura + 1 escrita).
+• O nome da migração executada fica gravado na tabela "migracoes".
+• executar_uma_vez() roda as pendentes uma vez por processo — as páginas
+  não precisam mais corrigir dados durante a renderização. Se falhar, o erro
+  fica guardado e só há nova tentativa após ESPERA_APOS_FALHA segundos.
+"""
+
+import time
+import threading
+import streamlit as st
+from datetime import datetime
+from funcoes_compartilhadas import conversa_banco
+
+TABELA_MIGRACOES = "migracoes"
+
+TIPOS_MIGRACOES = {
+    "ID": "id",
+    "Nome": "texto",
+    "Data": "texto",
+    "Linhas": "texto",
+}
+
+ESPERA_APOS_FALHA = 15 * 60
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🛠️ MIGRAÇÕES
+# ──────────────────────────────────────────────────────────────────────────────
+def _clientes_data_cadastro() -> int:
+    """Preenche "Data do Cadastro" dos clientes antigos que vieram sem data."""
+    tipos = {"ID": "id", "Data do Cadastro": "data"}
+    df = conversa_banco.select("clientes", tipos)
+    if df.empty or "Data do Cadastro" not in df.columns:
+        return 0
+
+    ids = df["ID"].astype(str).str.strip()
+    vazio = df["Data do Cadastro"].isna() | (df["Data do Cadastro"].astype(str).str.strip() == "")
+    alvo = ids[vazio & (ids != "")]
+    if alvo.empty:
+        return 0
+
+    agora = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+    alteracoes = {i: {"Data do Cadastro": agora} for i in alvo}
+    return conversa_banco.update_lote("clientes", alteracoes, id_col="ID", tipos_colunas=tipos)
+
+
+# Em ordem de execução. Nunca renomeie uma migração já publicada.
+MIGRACOES = [
+    ("clientes_data_cadastro", _clientes_data_cadastro),
+]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# ▶️ EXECUÇÃO
+# ──────────────────────────────────────────────────────────────────────────────
+def executar_pendentes() -> list:
+    """Roda as migrações ainda não registradas. Retorna os nomes executados."""
+    conversa_banco.garantir_tabela(TABELA_MIGRACOES, list(TIPOS_MIGRACOES))
+    feitas = set(conversa_banco.select(TABELA_MIGRACOES, TIPOS_MIGRACOES)["Nome"].astype(str))
+
+    executadas = []
+    for nome, funcao in MIGRACOES:
+        if nome in feitas:
+            continue
+        linhas = funcao()
+        conversa_banco.insert(TABELA_MIGRACOES, {
+            "Nome": nome,
+            "Data": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+            "Linhas": str(linhas),
+        })
+        executadas.append(nome)
+    return executadas
+
+
+@st.cache_resource(show_spinner=False)
+def _estado() -> dict:
+    """Situação das migrações no processo (cache_resource não guarda exceções)."""
+    return {"feito": False, "executadas": [], "erro": "", "proxima": 0.0, "trava": threading.Lock()}
+
+
+def executar_uma_vez() -> str:
+    """
+    executar_pendentes() uma vez por processo, sem deixar exceção escapar.
+    Falha não se repete a cada rerun: nova tentativa só depois de ESPERA_APOS_FALHA s.
+    Retorna o erro da última tentativa ("" se ok) para ser exibido ao admin.
+    """
+    estado = _estado()
+    if estado["feito"] or time.time() < estado["proxima"]:
+        return estado["erro"]
+    if not estado["trava"].acquire(blocking=False):
+        return estado["erro"]  # outra sessão já está rodando
+    try:
+        if not estado["feito"] and time.time() >= estado["proxima"]:
+            try:
+                estado.update(executadas=executar_pendentes(), feito=True, erro="")
+            except Exception as e:
+                estado.update(erro=str(e) or type(e).__name__, proxima=time.time() + ESPERA_APOS_FALHA)
+    finally:
+        estado["trava"].release()
+    return estado["erro"]
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Árvore de navegação da sidebar: {nome do menu: {Caminho: nome da funcionalidade}}.
+
+• Montada com um sort + merge + groupby (sem iterrows por menu).
+• Só entram funcionalidades cujo Caminho existe em paginas/ (registro_paginas).
+• Guardada por conjunto de permissões + versões de menus e funcionalidades:
+  todas as sessões com o mesmo acesso reutilizam a mesma árvore.
+"""
+
+import pandas as pd
+import streamlit as st
+from funcoes_compartilhadas import conversa_banco, barramento, registro_paginas
+from funcoes_compartilhadas.controle_acesso import (
+    Acesso, TABELA_FUNCIONALIDADES, TIPOS_FUNCIONALIDADES,
+)
+
+TABELA_MENUS = "menus"
+TIPOS_MENUS = {
+    "ID": "id",
+    "Nome": "texto",
+    "Ordem": "numero100",
+}
+
+
+def _texto(serie: pd.Series) -> pd.Series:
+    return serie.fillna("").astype(str).str.strip()
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _montar(liberadas: tuple | None, versao_menus, versao_funcionalidades) -> dict:
+    menus = conversa_banco.select(TABELA_MENUS, TIPOS_MENUS)
+    funcs = conversa_banco.select(TABELA_FUNCIONALIDADES, TIPOS_FUNCIONALIDADES)
+    if menus.empty or funcs.empty:
+        return {}
+
+    funcs = pd.DataFrame({
+        "menu": _texto(funcs["ID_Menu"]),
+        "id": _texto(funcs["ID"]),
+        "caminho": _texto(funcs["Caminho"]),
+        "nome": funcs["Nome"],
+    })
+    if liberadas is not None:
+        funcs = funcs[funcs["id"].isin(liberadas)]
+    # Caminho sem página correspondente não entra no menu
+    funcs = funcs[funcs["caminho"].isin(registro_paginas.paginas_disponiveis())]
+
+    menus = pd.DataFrame({
+        "menu": _texto(menus["ID"]),
+        "menu_nome": menus["Nome"],
+        "ordem": pd.to_numeric(menus["Ordem"], errors="coerce"),
+    }).sort_values("ordem", kind="stable")
+
+    # merge interno mantém a ordem dos menus; groupby sem sort também
+    juntos = menus.merge(funcs, on="menu", how="inner", sort=False)
+    return {
+        nome: dict(zip(grupo["caminho"], grupo["nome"]))
+        for nome, grupo in juntos.groupby("menu_nome", sort=False)
+    }
+
+
+def arvore_menus(acesso: Acesso) -> dict:
+    """Menus e funcionalidades liberados para `acesso` (não alterar o dict devolvido)."""
+    barramento.assinar(TABELA_MENUS)
+    barramento.assinar(TABELA_FUNCIONALIDADES)
+    liberadas = None if acesso.total else tuple(sorted(acesso.funcionalidades))
+    return _montar(
+        liberadas,
+        conversa_banco.versao(TABELA_MENUS),
+        conversa_banco.versao(TABELA_FUNCIONALIDADES),
+    )
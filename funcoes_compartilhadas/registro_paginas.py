@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Registro dos módulos de página (pasta paginas/).
+
+• Cada página é importada uma única vez por processo, só quando é aberta.
+• Em modo de desenvolvimento (APP_MODO_DEV=1 ou modo_dev em secrets) a página
+  é recarregada apenas quando o arquivo .py muda (mtime).
+• Caminhos de funcionalidades são validados contra os arquivos existentes:
+  nada fora de paginas/ é importado.
+"""
+
+import os
+import sys
+import importlib
+import threading
+import streamlit as st
+from types import ModuleType
+
+PACOTE = "paginas"
+PASTA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), PACOTE)
+
+
+def _modo_dev() -> bool:
+    if "APP_MODO_DEV" in os.environ:
+        return os.environ["APP_MODO_DEV"] == "1"
+    try:
+        return bool(st.secrets.get("modo_dev", False))
+    except Exception:
+        return False
+
+
+MODO_DEV = _modo_dev()
+
+_trava = threading.Lock()
+_carregadas: dict[str, tuple[ModuleType, float]] = {}
+
+
+def _listar() -> frozenset:
+    return frozenset(
+        nome[:-3] for nome in os.listdir(PASTA)
+        if nome.endswith(".py") and not nome.startswith("_")
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def _paginas_producao() -> frozenset:
+    return _listar()
+
+
+def paginas_disponiveis() -> frozenset:
+    """Nomes (sem .py) das páginas em paginas/."""
+    return _listar() if MODO_DEV else _paginas_producao()
+
+
+def existe(caminho: str) -> bool:
+    return str(caminho).strip() in paginas_disponiveis()
+
+
+def invalidos(caminhos) -> list:
+    """Caminhos que não correspondem a nenhuma página."""
+    disponiveis = paginas_disponiveis()
+    return [c for c in caminhos if str(c).strip() not in disponiveis]
+
+
+def carregar(caminho: str) -> ModuleType:
+    """Módulo da página `caminho` (import único; reload por mtime em modo dev)."""
+    caminho = str(caminho).strip()
+    if caminho not in paginas_disponiveis():
+        raise KeyError(f"Página '{caminho}' não encontrada em {PACOTE}/")
+
+    with _trava:
+        guardada = _carregadas.get(caminho)
+        if guardada and not MODO_DEV:
+            return guardada[0]
+
+        mtime = os.path.getmtime(os.path.join(PASTA, f"{caminho}.py"))
+        if guardada and guardada[1] == mtime:
+            return guardada[0]
+
+        nome = f"{PACOTE}.{caminho}"
+        if guardada and nome in sys.modules:
+            mod = importlib.reload(sys.modules[nome])
+        else:
+            mod = importlib.import_module(nome)
+        _carregadas[caminho] = (mod, mtime)
+        return mod
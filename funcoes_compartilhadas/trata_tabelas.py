@@ -6,20 +6,32 @@ Camada UI genérica – exibe, filtra, edita. Não converte dados!
 • Números sempre com 2 casas decimais.
 • Vírgula digitada tratada como ponto.
 • Funções especiais: Deletar e Clonar Seleção.
+• painel_tabela: tudo isso num fragmento (cliques não reexecutam a página).
 """
 
 import streamlit as st
 import pandas as pd
 import re
+import numpy as np
+from math import ceil
 from typing import Dict, Any, List, Callable
+from streamlit.errors import StreamlitAPIException
 from datetime import datetime
 from io import BytesIO
+from funcoes_compartilhadas.cria_id import cria_ids
+from funcoes_compartilhadas import indice_busca
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 🔄 FORÇA RERUN
 # ──────────────────────────────────────────────────────────────────────────────
-def _rerun():
-    (st.rerun if hasattr(st, "rerun") else st.experimental_rerun)()
+def _rerun(escopo: str = "app"):
+    if not hasattr(st, "rerun"):
+        return st.experimental_rerun()
+    try:
+        st.rerun(scope=escopo)
+    except StreamlitAPIException:
+        # escopo "fragment" fora de um fragmento → rerun completo
+        st.rerun()
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -33,21 +45,21 @@ def gerenciar_estado_grid(page_id: str):
         st.session_state["_pagina_atual"] = page_id
 
 
+def limpar_estado_grid(key: str) -> None:
+    """
+    Esquece seleção, edições guardadas e o estado dos data_editors do grid `key`.
+    Chamar depois de gravar/excluir: senão voltam como diferenças/seleção fantasma.
+    """
+    editores = re.compile(rf"{re.escape(key)}(_p\d+_.*)?")
+    for k in list(st.session_state):
+        if k in (f"{key}_selecionados", f"{key}_edicoes") or editores.fullmatch(k):
+            del st.session_state[k]
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # 📊 GRID EDITÁVEL COM SELEÇÃO
 # ──────────────────────────────────────────────────────────────────────────────
-def grid(df: pd.DataFrame, col_visiveis: Dict[str, str | Any],
-         id_col: str, key: str = "grid",
-         exportar_excel: bool = True, nome_arquivo: str = "dados.xlsx"
-         ) -> tuple[pd.DataFrame, List[Any]]:
-    if df.empty:
-        st.info("Nenhum registro para exibir.")
-        return df.copy(), []
-
-    df = df.reset_index(drop=True)
-    df.insert(0, "Selecionar", False)
-    df["_row"] = df.index
-
+def _config_colunas(df: pd.DataFrame, col_visiveis: Dict[str, str | Any]) -> Dict[str, Any]:
     cfg: Dict[str, Any] = {
         "Selecionar": st.column_config.CheckboxColumn("", width="60"),
         "_row": None,
@@ -62,39 +74,151 @@ def grid(df: pd.DataFrame, col_visiveis: Dict[str, str | Any],
             cfg[campo] = st.column_config.NumberColumn(rotulo, format="%.2f")
         else:
             cfg[campo] = rotulo
+    return cfg
+
+
+def _botao_excel(df: pd.DataFrame, nome_arquivo: str):
+    # 🔽 Botão Exportar Excel logo abaixo, à direita
+    col1, col2, col3 = st.columns([30, 6, 4])
+    with col3:
+        buffer = BytesIO()
+        df.drop(columns=["Selecionar", "_row"], errors="ignore").to_excel(buffer, index=False)
+        buffer.seek(0)
+        st.download_button(
+            label="📥 Excel",
+            data=buffer,
+            file_name=nome_arquivo if nome_arquivo.endswith(".xlsx") else nome_arquivo + ".xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            use_container_width=True,
+        )
+
+
+def grid(df: pd.DataFrame, col_visiveis: Dict[str, str | Any],
+         id_col: str, key: str = "grid",
+         exportar_excel: bool = True, nome_arquivo: str = "dados.xlsx"
+         ) -> tuple[pd.DataFrame, List[Any]]:
+    if df.empty:
+        st.info("Nenhum registro para exibir.")
+        return df.copy(), []
+
+    df = df.reset_index(drop=True)
+    df.insert(0, "Selecionar", False)
+    df["_row"] = df.index
 
     edit = st.data_editor(
         df[["Selecionar", *col_visiveis, "_row"]],
         hide_index=True,
         num_rows="fixed",
         use_container_width=True,
-        column_config=cfg,
+        column_config=_config_colunas(df, col_visiveis),
         key=key,
     )
 
     ids = df.loc[edit[edit["Selecionar"]]["_row"], id_col].tolist()
 
+    if exportar_excel:
+        _botao_excel(df, nome_arquivo)
 
+    return edit, ids
 
-    # 🔽 Botão Exportar Excel logo abaixo, à direita
-    if exportar_excel:
-        col1, col2, col3 = st.columns([30, 6, 4])
-        with col3:
-            buffer = BytesIO()
-            df.drop(columns=["Selecionar", "_row"], errors="ignore").to_excel(buffer, index=False)
-            buffer.seek(0)
-            st.download_button(
-                label="📥 Excel",
-                data=buffer,
-                file_name=nome_arquivo if nome_arquivo.endswith(".xlsx") else nome_arquivo + ".xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                use_container_width=True,
-            )
 
+# ──────────────────────────────────────────────────────────────────────────────
+# 📑 GRID PAGINADO (só a página visível vai para o navegador)
+# ──────────────────────────────────────────────────────────────────────────────
+def _ordenar_posicoes(df: pd.DataFrame, coluna: str | None, crescente: bool) -> np.ndarray:
+    if not coluna:
+        return np.arange(len(df))
+    try:
+        serie = df[coluna].sort_values(ascending=crescente, kind="stable")
+    except TypeError:
+        # colunas da planilha às vezes misturam número e texto
+        serie = df[coluna].astype(str).sort_values(ascending=crescente, kind="stable")
+    return serie.index.to_numpy()
+
+
+def grid_paginado(df: pd.DataFrame, col_visiveis: Dict[str, str | Any],
+                  id_col: str, key: str = "grid", tamanho_pagina: int = 50,
+                  exportar_excel: bool = True, nome_arquivo: str = "dados.xlsx"
+                  ) -> tuple[pd.DataFrame, List[Any]]:
+    """
+    Mesmo contrato do grid(), para tabelas grandes.
+
+    • Ordenação e paginação rodam no servidor; o data_editor recebe só a página.
+    • Seleção e edições ficam guardadas por ID na sessão, valendo entre páginas.
+    • Retorna as linhas da página + as editadas em outras páginas, com "_row"
+      apontando para a posição global (compatível com salvar_edicoes).
+    """
+    if df.empty:
+        st.info("Nenhum registro para exibir.")
+        return df.copy(), []
+
+    df = df.reset_index(drop=True)
+    cols = list(col_visiveis)
+    selecionados: set = st.session_state.setdefault(f"{key}_selecionados", set())
+    edicoes: Dict[Any, dict] = st.session_state.setdefault(f"{key}_edicoes", {})
+
+    # ─── Controles ────────────────────────────────────────────
+    n_paginas = max(1, ceil(len(df) / tamanho_pagina))
+    c1, c2, c3 = st.columns([4, 2, 2])
+    ordem = c1.selectbox("Ordenar por", ["—", *cols], key=f"{key}_ordem")
+    crescente = c2.toggle("Crescente", value=True, key=f"{key}_crescente")
+    pagina = int(c3.number_input(f"Página (de {n_paginas})", min_value=1, max_value=n_paginas,
+                                 value=1, step=1, key=f"{key}_pagina"))
+
+    # ─── Fatia da página ──────────────────────────────────────
+    pos = _ordenar_posicoes(df, None if ordem == "—" else ordem, crescente)
+    fatia = pos[(pagina - 1) * tamanho_pagina: pagina * tamanho_pagina]
+    vis = df.iloc[fatia]
+
+    pag = vis[cols].copy()
+    pag.insert(0, "Selecionar", vis[id_col].isin(selecionados).to_numpy())
+    pag["_row"] = fatia
+    pag.index = vis[id_col].to_numpy()
+
+    # reaplica edições feitas antes nesta página
+    guardadas = [i for i in pag.index if i in edicoes]
+    for i in guardadas:
+        for c, v in edicoes[i].items():
+            pag.at[i, c] = v
 
+    edit = st.data_editor(
+        pag,
+        hide_index=True,
+        num_rows="fixed",
+        use_container_width=True,
+        column_config=_config_colunas(df, col_visiveis),
+        key=f"{key}_p{pagina}_{ordem}_{crescente}",
+    )
+    st.caption(f"{len(df)} registro(s) • {len(selecionados)} selecionado(s)")
+
+    # ─── Atualiza seleção e edições da sessão ─────────────────
+    ids_pagina = vis[id_col].to_numpy()
+    edit.index = ids_pagina
+    selecionados.difference_update(ids_pagina)
+    selecionados.update(edit.index[edit["Selecionar"]])
+
+    orig = vis[cols].set_axis(ids_pagina)
+    mudou = (edit[cols].astype(str) != orig.astype(str)).any(axis=1)
+    for i in ids_pagina:
+        edicoes.pop(i, None)
+    for i, linha in edit.loc[mudou, cols].iterrows():
+        edicoes[i] = linha.to_dict()
+
+    # edições de outras páginas (ID → posição global atual)
+    pos_por_id = pd.Series(df.index, index=df[id_col])
+    outras = [i for i in edicoes if i not in set(ids_pagina) and i in pos_por_id.index]
+    if outras:
+        extra = pd.DataFrame.from_dict({i: edicoes[i] for i in outras}, orient="index")
+        extra.insert(0, "Selecionar", extra.index.isin(selecionados))
+        extra["_row"] = pos_por_id.loc[outras].to_numpy()
+        edit = pd.concat([edit, extra[edit.columns]])
+
+    ids = df.loc[df[id_col].isin(selecionados), id_col].tolist()
 
+    if exportar_excel:
+        _botao_excel(df, nome_arquivo)
 
-    return edit, ids
+    return edit.reset_index(drop=True), ids
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -108,7 +232,14 @@ def _to_float(v):
     return v
 
 
-def salvar_edicoes(editado, original, editaveis: List[str], fn_update: Callable, tabela: str, id_col: str, tipos: dict):
+def salvar_edicoes(editado, original, editaveis: List[str], fn_update: Callable, tabela: str, id_col: str, tipos: dict,
+                   fn_update_lote: Callable | None = None, key: str | None = None):
+    """
+    Compara o grid editado com o original e grava as diferenças.
+    Se `fn_update_lote` for informado (ex.: conversa_banco.update_lote),
+    todas as alterações vão em uma única leitura + escrita.
+    key: chave do grid – o estado dele é limpo depois de gravar.
+    """
     if editado.empty:
         return
 
@@ -127,24 +258,38 @@ def salvar_edicoes(editado, original, editaveis: List[str], fn_update: Callable,
         return
 
     if st.button("💾 Salvar Alterações"):
-        tot = 0
-        for ch in changes:
-            tot += fn_update(
-                tabela,
-                list(ch["val"].keys()),
-                list(ch["val"].values()),
-                where=f"{id_real},eq,{ch['id']}",
-                tipos_colunas=tipos,
-            )
+        if fn_update_lote:
+            alteracoes: Dict[Any, dict] = {}
+            for ch in changes:
+                alteracoes.setdefault(ch["id"], {}).update(ch["val"])
+            tot = fn_update_lote(tabela, alteracoes, id_col=id_real, tipos_colunas=tipos)
+        else:
+            tot = 0
+            for ch in changes:
+                tot += fn_update(
+                    tabela,
+                    list(ch["val"].keys()),
+                    list(ch["val"].values()),
+                    where=f"{id_real},eq,{ch['id']}",
+                    tipos_colunas=tipos,
+                )
+        if key:
+            limpar_estado_grid(key)
         st.success(f"✅ {tot} registro(s) atualizado(s).")
-        st.cache_data.clear()
         _rerun()
 
 
 # ──────────────────────────────────────────────────────────────────────────────
 # ⚙️ OPÇÕES ESPECIAIS (DELETE + CLONE)
 # ──────────────────────────────────────────────────────────────────────────────
-def opcoes_especiais(tabela: str, ids: List[Any], fn_delete: Callable, id_col: str, tipos: dict, fn_insert: Callable | None = None):
+def opcoes_especiais(tabela: str, ids: List[Any], fn_delete: Callable, id_col: str, tipos: dict, fn_insert: Callable | None = None,
+                     df: pd.DataFrame | None = None, key: str | None = None):
+    """
+    Deletar / clonar as linhas selecionadas.
+    Passe em `df` a tabela que já está em memória (a mesma do grid) para o
+    clone não precisar ler a planilha de novo.
+    key: chave do grid – seleção e edições são limpas depois de excluir/clonar.
+    """
     if not ids:
         return
 
@@ -162,23 +307,25 @@ def opcoes_especiais(tabela: str, ids: List[Any], fn_delete: Callable, id_col: s
                 aviso = st.info("DELETANDO DADOS, AGUARDE...")
                 tot = sum(fn_delete(tabela, f"{id_col},eq,{i}", tipos) for i in ids)
                 aviso.empty()
+                if key:
+                    limpar_estado_grid(key)
                 st.success(f"🗑️ {tot} registro(s) deletado(s).")
-                st.cache_data.clear()
                 _rerun()
 
         # Clone
         if opcao == "📄 Clonar Seleção" and fn_insert:
             st.markdown("### 📝 Editar antes de clonar")
 
-            from funcoes_compartilhadas import conversa_banco as _cb
+            if df is None:
+                from funcoes_compartilhadas import conversa_banco as _cb
+                df = _cb.select(tabela, tipos)
 
-            df_total = _cb.select(tabela, tipos)
-            df_sel = df_total[df_total[id_col].isin(ids)].reset_index(drop=True)
+            df_sel = df[df[id_col].isin(ids)].reset_index(drop=True)
             if df_sel.empty:
                 st.warning("Nada para clonar.")
                 return
 
-            df_edit = df_sel.drop(columns=[id_col], errors="ignore")
+            df_edit = df_sel.drop(columns=[id_col, "Selecionar", "_row"], errors="ignore")
             st.write("Altere valores (ID será gerado automaticamente).")
 
             edit = st.data_editor(
@@ -193,40 +340,87 @@ def opcoes_especiais(tabela: str, ids: List[Any], fn_delete: Callable, id_col: s
 
             if st.button("📄 Confirmar Cópia", key="confirmar_clone"):
                 aviso = st.info("CLONANDO DADOS, AGUARDE...")
-                novos: List[dict] = []
                 agora = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
 
-                for _, linha in edit.iterrows():
-                    base = linha.to_dict()
-                    for col, tp in tipos.items():
-                        if tp == "data" and col in base:
-                            base[col] = agora
-                    for _ in range(qtd):
-                        novos.append(base.copy())
+                # N cópias de cada linha, na mesma ordem da seleção
+                novos = edit.loc[edit.index.repeat(qtd)].reset_index(drop=True)
+                cols_data = [c for c, tp in tipos.items() if tp == "data" and c in novos.columns]
+                if cols_data:
+                    novos[cols_data] = agora
+                novos.insert(0, id_col, cria_ids(len(novos), prefixo="clone"))
 
-                if novos:
-                    fn_insert(tabela, pd.DataFrame(novos))
+                if not novos.empty:
+                    fn_insert(tabela, novos)
 
                 aviso.empty()
+                if key:
+                    limpar_estado_grid(key)
                 st.success(f"✅ {len(novos)} registro(s) inserido(s).")
-                st.cache_data.clear()
                 st.rerun()
 
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 🔍 FILTRO DE TABELA
 # ──────────────────────────────────────────────────────────────────────────────
-def filtrar_tabela(df: pd.DataFrame, campos: List[str], nome: str = "filtro") -> pd.DataFrame:
+def filtrar_tabela(df: pd.DataFrame, campos: List[str], nome: str = "filtro", tabela: str | None = None) -> pd.DataFrame:
+    """
+    Filtro por palavra/prefixo (sem diferenciar maiúsculas e acentos), usando
+    o índice de busca em cache. Resultado ordenado pelo melhor casamento.
+    Informe `tabela` quando `df` for o select completo: o índice fica
+    atrelado à versão da tabela em vez do hash do conteúdo.
+    O filtro aplicado fica na sessão até "Limpar".
+    """
+    chave_aplicado = f"{nome}_aplicado"
     with st.popover("🔍 Filtros"):
         st.subheader("Filtrar Dados")
-        filtros = {c: st.text_input(f"{c} contém", key=f"{nome}_{c}") for c in campos}
+        filtros = {c: st.text_input(f"{c} começa com", key=f"{nome}_{c}", help="Palavras que começam com o texto digitado") for c in campos}
         col1, col2 = st.columns([2, 1.5])
         if col1.button("✅ Aplicar", key=f"{nome}_aplicar"):
-            for c, v in filtros.items():
-                if v:
-                    df = df[df[c].astype(str).str.contains(v, case=False, na=False)]
+            st.session_state[chave_aplicado] = {c: v for c, v in filtros.items() if v}
         if col2.button("🧹 Limpar", key=f"{nome}_limpar"):
-            st.session_state.clear()
-            _rerun()
+            for k in [chave_aplicado, *(f"{nome}_{c}" for c in campos)]:
+                st.session_state.pop(k, None)
+            _rerun("fragment")
+
+    consultas = st.session_state.get(chave_aplicado)
+    if consultas:
+        versao = None
+        if tabela:
+            from funcoes_compartilhadas import conversa_banco as _cb
+            versao = _cb.versao(tabela)
+        idx = indice_busca.indice(df, campos, chave=tabela or nome, versao=versao)
+        df = df.iloc[idx.buscar(consultas)]
     return df
 
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 🧩 PAINEL DA TABELA (FRAGMENTO)
+# ──────────────────────────────────────────────────────────────────────────────
+@st.fragment
+def painel_tabela(df: pd.DataFrame, col_visiveis: Dict[str, str | Any], id_col: str,
+                  tabela: str, tipos: dict, editaveis: List[str] | None = None,
+                  campos_filtro: List[str] | None = None, key: str = "grid",
+                  paginado: bool = False, tamanho_pagina: int = 50,
+                  clonar: bool = True, nome_arquivo: str = "dados.xlsx"):
+    """
+    Filtro + grid + salvar + opções especiais dentro de um st.fragment.
+
+    Marcar linhas, filtrar, paginar ou escolher uma opção reexecuta só este
+    painel (sem refazer sidebar, CSS e selects da página). Gravações no
+    banco continuam disparando um rerun completo.
+    """
+    from funcoes_compartilhadas import conversa_banco as _cb
+
+    if campos_filtro:
+        df = filtrar_tabela(df, campos_filtro, nome=f"{key}_filtro", tabela=tabela)
+
+    fn_grid = grid_paginado if paginado else grid
+    extra = {"tamanho_pagina": tamanho_pagina} if paginado else {}
+    edit, ids = fn_grid(df, col_visiveis, id_col, key=key, nome_arquivo=nome_arquivo, **extra)
+
+    if editaveis:
+        salvar_edicoes(edit, df, editaveis, _cb.update, tabela, id_col, tipos,
+                       fn_update_lote=_cb.update_lote, key=key)
+
+    opcoes_especiais(tabela, ids, _cb.delete, id_col, tipos,
+                     fn_insert=_cb.insert if clonar else None, df=df, key=key)
@@ -0,0 +1,42 @@
+import streamlit as st
+from funcoes_compartilhadas import conversa_banco, aniversarios, formatadores
+from paginas.cadastro_clientes import TABELA, TIPOS_COLUNAS
+
+# Colunas exibidas na lista de aniversariantes
+COLUNAS_LISTA = [
+    "Aniversário", "Faltam (dias)", "Idade",
+    "Nome / Razão Social", "Apelido / Nome Fantasia", "celular", "celular1",
+]
+
+
+# Lista de clientes com aniversário nos próximos dias
+def listar_aniversariantes():
+    st.title("Aniversariantes")
+
+    dias = int(st.number_input("Próximos dias", min_value=0, max_value=366, value=7, step=1))
+
+    df = conversa_banco.select(TABELA, TIPOS_COLUNAS)
+    if df.empty:
+        st.info("Nenhum cliente cadastrado ainda.")
+        return
+
+    lista = aniversarios.proximos_aniversarios(df, TABELA, conversa_banco.versao(TABELA), dias)
+    if lista.empty:
+        st.info("Nenhum aniversário no período.")
+        return
+
+    for col in ("celular", "celular1"):
+        if col in lista.columns:
+            lista[col] = formatadores.formatar_celular(lista[col])
+
+    st.caption(f"{len(lista)} aniversariante(s)")
+    st.dataframe(
+        lista[[c for c in COLUNAS_LISTA if c in lista.columns]],
+        hide_index=True,
+        use_container_width=True,
+    )
+
+
+# Função principal que organiza a página
+def app():
+    listar_aniversariantes()
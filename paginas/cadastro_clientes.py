@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 import streamlit as st
 from datetime import datetime, date
-from funcoes_compartilhadas import conversa_banco, cria_id
+from funcoes_compartilhadas import conversa_banco, cria_id, datas, indice_busca, indice_documentos, formatadores
+from funcoes_compartilhadas import cep as cep_offline
 import re
 
 # Nome da tabela no banco
@@ -30,17 +31,26 @@ TIPOS_COLUNAS = {
     "celular1": "texto",
 }
 
+# Campos usados na busca de clientes
+CAMPOS_BUSCA = ["Nome / Razão Social", "Apelido / Nome Fantasia", "CPF", "celular", "celular1"]
+LIMITE_BUSCA = 10
+
+# Campos preenchidos pelo CEP (guardados em session_state com o próprio nome)
+CAMPOS_ENDERECO = ["CEP", "Endereço", "Bairro", "Cidade", "Estado"]
+
+# Formatos de exibição por coluna (funcoes_compartilhadas.formatadores)
+FORMATOS_EXIBICAO = {
+    "CPF": "cpf",
+    "celular": "celular",
+    "celular1": "celular",
+    "Data de Nascimento": "data_br",
+    "Data do Cadastro": "data_br",
+}
+
 # ----------------- FUNÇÕES AUXILIARES -----------------
 def parse_data(data_str):
-    """Tenta converter datas em diferentes formatos para datetime."""
-    if not data_str or str(data_str).strip() == "":
-        return None
-    for fmt in ("%d/%m/%Y", "%m/%d/%Y", "%Y-%m-%d", "%d/%m/%Y %H:%M:%S", "%Y-%m-%d %H:%M:%S"):
-        try:
-            return datetime.strptime(str(data_str), fmt)
-        except ValueError:
-            continue
-    return None
+    """Converte datas em diferentes formatos para datetime (serviço compartilhado)."""
+    return datas.interpretar_data(data_str)
 
 def format_data_br(data_str):
     """Converte qualquer formato para DD/MM/YYYY HH:mm:ss"""
@@ -69,6 +79,30 @@ def format_celular(cel: str) -> str:
         return f"({cel_num[:2]}) {cel_num[2:6]}-{cel_num[6:]}"
     return cel
 
+def _rotulo_cliente(cliente) -> str:
+    """Texto exibido na lista de resultados da busca (linha já formatada)"""
+    partes = [str(cliente.get("Nome / Razão Social", "") or "-")]
+    for campo in ("CPF", "celular"):
+        if cliente.get(campo):
+            partes.append(str(cliente[campo]))
+    return " — ".join(partes)
+
+def _carregar_endereco(cliente: dict):
+    """Copia CEP/endereço do cliente para os campos (que usam session_state)"""
+    for campo in CAMPOS_ENDERECO:
+        valor = cliente.get(campo, "")
+        st.session_state[campo] = "" if valor is None else str(valor)
+
+def _preencher_por_cep():
+    """Callback do campo CEP: completa o endereço pela base offline de CEPs"""
+    achado = cep_offline.buscar_cep(st.session_state.get("CEP", ""))
+    st.session_state["_cep_nao_encontrado"] = achado is None and cep_offline.disponivel()
+    if achado:
+        st.session_state["Endereço"] = achado["logradouro"]
+        st.session_state["Bairro"] = achado["bairro"]
+        st.session_state["Cidade"] = achado["cidade"]
+        st.session_state["Estado"] = achado["uf"]
+
 def limpar_campos():
     """Limpa todos os campos do formulário"""
     for key in [
@@ -94,54 +128,46 @@ def app():
             st.info("Nenhum cliente cadastrado ainda.")
             return
 
-        # 🔹 Atualiza registros antigos sem "Data do Cadastro"
-        for idx, row in df_clientes.iterrows():
-            if not row.get("Data do Cadastro"):
-                conversa_banco.update(
-                    TABELA,
-                    ["Data do Cadastro"],
-                    [datetime.now().strftime("%d/%m/%Y %H:%M:%S")],
-                    where=f"ID,eq,{row['ID']}",
-                    tipos_colunas=TIPOS_COLUNAS
-                )
+        # Datas que o select não conseguiu interpretar (ficam como estão na planilha)
+        datas_invalidas = df_clientes.attrs.get("datas_invalidas", {})
+        if datas_invalidas:
+            with st.expander("⚠️ Datas não reconhecidas na planilha"):
+                for col, valores in datas_invalidas.items():
+                    st.write(f"**{col}:** " + ", ".join(map(str, valores[:50])))
 
-        # Filtros de busca
-        col1, col2 = st.columns(2)
-        with col1:
-            nome_sel = st.selectbox(
-                "🔎 Buscar por Nome",
-                options=[""] + df_clientes["Nome / Razão Social"].dropna().unique().tolist(),
-                index=0,
-            )
-        with col2:
-            cpf_sel = st.selectbox(
-                "🔎 Buscar por CPF",
-                options=[""] + df_clientes["CPF"].dropna().unique().tolist(),
-                index=0,
-            )
+        # Busca por nome, apelido, CPF ou celular (índice em cache por versão da tabela)
+        termo = st.text_input("🔎 Buscar cliente (nome, apelido, CPF ou celular)", key="busca_cliente")
 
         cliente_selecionado = None
-        if nome_sel:
-            cliente_selecionado = df_clientes[df_clientes["Nome / Razão Social"] == nome_sel].iloc[0].to_dict()
-        elif cpf_sel:
-            cliente_selecionado = df_clientes[df_clientes["CPF"] == cpf_sel].iloc[0].to_dict()
+        if termo:
+            versao = conversa_banco.versao(TABELA)
+            campos = [c for c in CAMPOS_BUSCA if c in df_clientes.columns]
+            indice = indice_busca.indice(df_clientes, campos, chave=TABELA, versao=versao)
+            achados = df_clientes.iloc[indice.buscar_texto(termo, limite=LIMITE_BUSCA)]
+            if achados.empty:
+                st.info("Nenhum cliente encontrado.")
+            else:
+                # Formata só as linhas encontradas (CPF, celulares, datas)
+                achados_fmt = formatadores.formatar(achados, FORMATOS_EXIBICAO)
+                pos = st.selectbox(
+                    f"Clientes encontrados (até {LIMITE_BUSCA})",
+                    options=range(len(achados)),
+                    format_func=lambda i: _rotulo_cliente(achados_fmt.iloc[i]),
+                )
+                cliente_selecionado = achados.iloc[pos].to_dict()
+                cliente_exibicao = achados_fmt.iloc[pos].to_dict()
 
         if cliente_selecionado:
             st.markdown("### 👤 Dados do Cliente")
             for campo in TIPOS_COLUNAS.keys():
-                valor = cliente_selecionado.get(campo, "")
-                if campo == "CPF":
-                    valor = format_cpf(valor)
-                elif campo in ["celular", "celular1"]:
-                    valor = format_celular(valor)
-                elif campo in ["Data do Cadastro", "Data de Nascimento"]:
-                    valor = format_data_br(valor)
+                valor = cliente_exibicao.get(campo, "")
                 st.write(f"**{campo}:** {valor if valor else '-'}")
 
             col1, col2 = st.columns(2)
             with col1:
                 if st.button(f"✏️ Editar {cliente_selecionado['ID']}", key=f"editar_{cliente_selecionado['ID']}"):
                     st.session_state["cliente_edicao"] = cliente_selecionado
+                    _carregar_endereco(cliente_selecionado)
                     st.rerun()
             with col2:
                 if st.button(f"🗑️ Excluir {cliente_selecionado['ID']}", key=f"excluir_{cliente_selecionado['ID']}"):
@@ -159,6 +185,14 @@ def app():
     st.markdown("---")
 
     # ------------------- FORMULÁRIO DE CADASTRO/EDIÇÃO -------------------
+    # CEP fica fora do form: ao digitar, o endereço é preenchido na hora
+    for campo in CAMPOS_ENDERECO:
+        st.session_state.setdefault(campo, "")
+    st.text_input("CEP", key="CEP", on_change=_preencher_por_cep,
+                  help="Endereço, bairro, cidade e estado são preenchidos pelo CEP.")
+    if st.session_state.get("_cep_nao_encontrado"):
+        st.caption("CEP não encontrado na base local.")
+
     with st.form(key="form_cadastro_cliente", clear_on_submit=False):
         st.markdown("**Dados do Cliente**")
 
@@ -180,13 +214,13 @@ def app():
             max_value=date.today()
         )
 
-        cep = st.text_input("CEP", value=cliente_edicao.get("CEP", ""))
-        endereco = st.text_input("Endereço", value=cliente_edicao.get("Endereço", ""))
+        cep = st.session_state["CEP"]
+        endereco = st.text_input("Endereço", key="Endereço")
         numero = st.text_input("Número", value=cliente_edicao.get("Número", ""))
         complemento = st.text_input("Complemento", value=cliente_edicao.get("Complemento", ""))
-        bairro = st.text_input("Bairro", value=cliente_edicao.get("Bairro", ""))
-        cidade = st.text_input("Cidade", value=cliente_edicao.get("Cidade", ""))
-        estado = st.text_input("Estado", value=cliente_edicao.get("Estado", ""))
+        bairro = st.text_input("Bairro", key="Bairro")
+        cidade = st.text_input("Cidade", key="Cidade")
+        estado = st.text_input("Estado", key="Estado")
         profissao = st.text_input("Profissão", value=cliente_edicao.get("Profissão", ""))
         observacao = st.text_area("Observação", value=cliente_edicao.get("Observação", ""))
 
@@ -200,9 +234,22 @@ def app():
         botao_salvar = st.form_submit_button("Salvar")
 
         if botao_salvar:
+            # CPF/telefones comparados só pelos dígitos (índice hash por versão da tabela)
+            docs = indice_documentos.indice(
+                conversa_banco.select(TABELA, TIPOS_COLUNAS), TABELA, conversa_banco.versao(TABELA)
+            )
+            cpf_dup = docs.duplicado("cpf", cpf, id_cliente.strip()) if indice_documentos.so_digitos(cpf) else ()
+
             if nome_razao.strip() == "":
                 st.warning("Digite o nome do cliente antes de salvar.")
+            elif cpf_dup:
+                st.error(f"❌ CPF já cadastrado para outro cliente (ID {cpf_dup[0]}).")
             else:
+                for tel in (celular, celular1):
+                    tel_dup = docs.duplicado("telefone", tel, id_cliente.strip()) if indice_documentos.so_digitos(tel) else ()
+                    if tel_dup:
+                        st.toast(f"⚠️ Celular {format_celular(tel)} também está no cliente {tel_dup[0]}.")
+
                 dados_cliente = {
                     "CPF": cpf,
                     "Origem do Cliente": origem,
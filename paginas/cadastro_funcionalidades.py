@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
-from funcoes_compartilhadas import conversa_banco
+from funcoes_compartilhadas import conversa_banco, registro_paginas, trata_tabelas
+from funcoes_compartilhadas.controle_acesso import TABELA_FUNCIONALIDADES, TIPOS_FUNCIONALIDADES
 
 # Função para cadastrar uma nova funcionalidade
 def cadastrar_funcionalidade():
@@ -28,6 +29,8 @@ def cadastrar_funcionalidade():
         if enviar:
             if not nome or not caminho:
                 st.error("Todos os campos são obrigatórios.")
+            elif not registro_paginas.existe(caminho):
+                st.error(f"Não existe a página 'paginas/{caminho.strip()}.py'.")
             else:
                 # Inserir dados na planilha 'funcionalidades'
                 dados_funcionalidade = {
@@ -42,15 +45,25 @@ def cadastrar_funcionalidade():
 # Exibir a lista de funcionalidades cadastradas
 def listar_funcionalidades():
     st.subheader("Funcionalidades Cadastradas")
-    funcionalidades = conversa_banco.select("funcionalidades", {
-        "ID": "id",
-        "ID_Menu": "texto",
-        "Nome": "texto",
-        "Caminho": "texto",
-    })
+    funcionalidades = conversa_banco.select(TABELA_FUNCIONALIDADES, TIPOS_FUNCIONALIDADES)
+
+    # Filtro, edição e exclusão num fragmento (cliques não refazem a página)
+    trata_tabelas.painel_tabela(
+        funcionalidades,
+        {"ID_Menu": "Menu (ID)", "Nome": "Nome", "Caminho": "Caminho"},
+        "ID", TABELA_FUNCIONALIDADES, TIPOS_FUNCIONALIDADES,
+        editaveis=["ID_Menu", "Nome", "Caminho"],
+        campos_filtro=["Nome", "Caminho"],
+        key="grid_funcionalidades",
+        paginado=True,
+        clonar=False,
+        nome_arquivo="funcionalidades.xlsx",
+    )
 
-    # Exibe a lista de funcionalidades
-    st.dataframe(funcionalidades)
+    # Avisa sobre caminhos que não apontam para nenhuma página
+    sem_pagina = registro_paginas.invalidos(funcionalidades["Caminho"].dropna().unique())
+    if sem_pagina:
+        st.warning("⚠️ Caminhos sem página correspondente (não aparecem no menu): " + ", ".join(map(str, sem_pagina)))
 
 # Função principal que organiza a página
 def app():
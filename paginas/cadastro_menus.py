@@ -62,11 +62,16 @@ def editar_menu(menu_id):
                 else:
                     st.error("Ocorreu um erro ao atualizar o menu. Tente novamente.")
 
-# Função para excluir um menu
+# Função para excluir um menu (com funcionalidades e permissões dependentes)
 def excluir_menu(menu_id):
-    # Exclui o menu da planilha
-    conversa_banco.delete("menus", where=f"ID,eq,{menu_id}", tipos_colunas={"ID": "id"})
-    st.success("Menu excluído com sucesso!")
+    # Exclui o menu e tudo que depende dele num único lote
+    removidas = conversa_banco.excluir_cascata("menus", [menu_id])
+    if not removidas.get("menus"):
+        st.warning("Menu não encontrado.")
+        return
+    dependentes = {t: n for t, n in removidas.items() if t != "menus"}
+    detalhe = ", ".join(f"{n} em '{t}'" for t, n in dependentes.items())
+    st.success("Menu excluído com sucesso!" + (f" Também removidas: {detalhe}." if detalhe else ""))
 
 # Exibir a lista de menus cadastrados
 def listar_menus():
@@ -0,0 +1,151 @@
+import streamlit as st
+import pandas as pd
+from funcoes_compartilhadas import conversa_banco
+from funcoes_compartilhadas.controle_acesso import (
+    TABELA_USUARIOS, TIPOS_USUARIOS, TABELA_FUNCIONALIDADES, TIPOS_FUNCIONALIDADES,
+    TABELA_PERFIS, TIPOS_PERFIS, garantir_tabelas_perfis,
+    funcionalidades_por_perfil, perfis_por_usuario,
+    definir_funcionalidades_perfis, definir_perfis_usuarios,
+    permissoes_redundantes, limpar_permissoes_redundantes,
+)
+from paginas.cadastro_permissoes import rotulos_funcionalidades, avisar_resultado
+
+
+# Função para cadastrar um novo perfil
+def cadastrar_perfil(df_perfis):
+    # Título da página
+    st.title("Cadastro de Perfis")
+
+    # Formulário de cadastro
+    with st.form("form_perfil"):
+        nome = st.text_input("Nome do Perfil")
+
+        # Botão de envio do formulário
+        enviar = st.form_submit_button("Cadastrar")
+
+        # Validação de dados
+        if enviar:
+            existentes = set(df_perfis["Nome"].astype(str).str.strip().str.lower())
+            if not nome.strip():
+                st.error("O nome do perfil é obrigatório.")
+            elif nome.strip().lower() in existentes:
+                st.error(f"Já existe o perfil '{nome.strip()}'.")
+            else:
+                conversa_banco.insert(TABELA_PERFIS, {"Nome": nome.strip()})
+                st.success(f"Perfil '{nome.strip()}' cadastrado com sucesso!")
+
+
+# Funcionalidades liberadas para um perfil
+def funcionalidades_do_perfil(df_perfis, df_funcionalidades):
+    st.subheader("Funcionalidades do Perfil")
+
+    perfis_opcoes = dict(zip(df_perfis["Nome"], df_perfis["ID"].astype(str).str.strip()))
+    funcs_opcoes = rotulos_funcionalidades(df_funcionalidades)
+    if not perfis_opcoes or not funcs_opcoes:
+        st.info("Cadastre perfis e funcionalidades primeiro.")
+        return
+
+    perfil_selecionado = st.selectbox("Selecione o Perfil", list(perfis_opcoes.keys()))
+    perfil_id = perfis_opcoes[perfil_selecionado]
+
+    atuais = funcionalidades_por_perfil().get(perfil_id, frozenset())
+    with st.form(f"form_perfil_funcionalidades_{perfil_id}"):
+        selecionadas = st.multiselect(
+            "Funcionalidades liberadas",
+            options=list(funcs_opcoes.keys()),
+            default=[r for r, i in funcs_opcoes.items() if i in atuais],
+        )
+        if st.form_submit_button("Salvar Funcionalidades"):
+            desejadas = {funcs_opcoes[r] for r in selecionadas}
+            avisar_resultado(*definir_funcionalidades_perfis({perfil_id: desejadas}))
+
+
+# Matriz usuário × perfil
+def perfis_dos_usuarios(df_usuarios, df_perfis):
+    st.subheader("Perfis dos Usuários")
+
+    # Linhas indexadas pelo ID do usuário (nomes podem se repetir); o nome é só rótulo
+    usuarios = dict(zip(df_usuarios["ID"].astype(str).str.strip(), df_usuarios["Nome"]))
+    perfis = dict(zip(df_perfis["ID"].astype(str).str.strip(), df_perfis["Nome"]))
+    if not usuarios or not perfis:
+        return
+
+    atuais = perfis_por_usuario()
+    ids_perfis = list(perfis)
+    colunas = list(perfis.values())
+    matriz = pd.DataFrame(
+        [[p in atuais.get(u, frozenset()) for p in ids_perfis] for u in usuarios],
+        index=pd.Index(list(usuarios), name="ID"),
+        columns=colunas,
+    )
+    matriz.insert(0, "Usuário", list(usuarios.values()))
+
+    with st.form("form_usuarios_perfis"):
+        editada = st.data_editor(
+            matriz,
+            use_container_width=True,
+            disabled=["Usuário"],
+            column_config={
+                "Usuário": st.column_config.TextColumn("Usuário"),
+                **{c: st.column_config.CheckboxColumn(c) for c in colunas},
+            },
+            key="matriz_usuarios_perfis",
+        )
+        salvar = st.form_submit_button("Salvar Perfis dos Usuários")
+
+    if salvar:
+        valores = editada[colunas].to_numpy(dtype=bool)
+        desejadas = {
+            u: {ids_perfis[j] for j in valores[i].nonzero()[0]}
+            for i, u in enumerate(editada.index)
+        }
+        inclusoes, retiradas = definir_perfis_usuarios(desejadas)
+        if inclusoes or retiradas:
+            st.success(f"Perfis atualizados: {inclusoes} inclusão(ões), {retiradas} retirada(s).")
+        else:
+            st.info("Nenhuma alteração.")
+
+
+# Lista dos perfis com a quantidade de funcionalidades e usuários
+def listar_perfis(df_perfis):
+    st.subheader("Perfis Cadastrados")
+    if df_perfis.empty:
+        st.warning("Nenhum perfil cadastrado.")
+        return
+
+    funcs = funcionalidades_por_perfil()
+    usuarios = pd.Series(
+        [p for perfis in perfis_por_usuario().values() for p in perfis], dtype=str
+    ).value_counts()
+    ids = df_perfis["ID"].astype(str).str.strip()
+    lista = pd.DataFrame({
+        "Perfil": df_perfis["Nome"],
+        "Funcionalidades": ids.map(lambda i: len(funcs.get(i, ()))),
+        "Usuários": ids.map(usuarios).fillna(0).astype(int),
+    })
+    st.dataframe(lista, hide_index=True, use_container_width=True)
+
+
+# Permissões diretas que os perfis já cobrem (encolhe a tabela permissoes)
+def limpar_redundantes():
+    redundantes = sum(len(f) for f in permissoes_redundantes().values())
+    if not redundantes:
+        return
+    st.info(f"{redundantes} permissão(ões) direta(s) já coberta(s) por perfis.")
+    if st.button("Remover permissões diretas redundantes"):
+        st.success(f"{limpar_permissoes_redundantes()} permissão(ões) removida(s).")
+
+
+# Função principal que organiza a página
+def app():
+    garantir_tabelas_perfis()
+
+    df_perfis = conversa_banco.select(TABELA_PERFIS, TIPOS_PERFIS)
+    df_usuarios = conversa_banco.select(TABELA_USUARIOS, TIPOS_USUARIOS)
+    df_funcionalidades = conversa_banco.select(TABELA_FUNCIONALIDADES, TIPOS_FUNCIONALIDADES)
+
+    cadastrar_perfil(df_perfis)
+    funcionalidades_do_perfil(df_perfis, df_funcionalidades)
+    perfis_dos_usuarios(df_usuarios, df_perfis)
+    listar_perfis(df_perfis)
+    limpar_redundantes()
@@ -1,85 +1,131 @@
 import streamlit as st
 import pandas as pd
 from funcoes_compartilhadas import conversa_banco
+from funcoes_compartilhadas.controle_acesso import (
+    TABELA_USUARIOS, TIPOS_USUARIOS, TABELA_FUNCIONALIDADES, TIPOS_FUNCIONALIDADES,
+    TABELA_PERMISSOES, TIPOS_PERMISSOES, permissoes_atuais, definir_permissoes,
+)
 
-# Função para cadastrar as permissões de um usuário
-def cadastrar_permissao():
+
+# Rótulos únicos para as funcionalidades (nome repetido → acrescenta o caminho)
+def rotulos_funcionalidades(df_funcionalidades: pd.DataFrame) -> dict:
+    nomes = df_funcionalidades["Nome"].astype(str)
+    repetido = nomes.duplicated(keep=False)
+    rotulos = nomes.where(~repetido, nomes + " (" + df_funcionalidades["Caminho"].astype(str) + ")")
+    return dict(zip(rotulos, df_funcionalidades["ID"].astype(str).str.strip()))
+
+
+# ID → "Nome (Email)": nomes podem se repetir, o ID é que identifica o usuário
+def rotulos_usuarios(df_usuarios: pd.DataFrame) -> dict:
+    ids = df_usuarios["ID"].astype(str).str.strip()
+    rotulos = df_usuarios["Nome"].astype(str) + " (" + df_usuarios["Email"].astype(str) + ")"
+    return dict(zip(ids, rotulos))
+
+
+# Mensagem com o resultado de uma gravação em lote
+def avisar_resultado(concedidas: int, revogadas: int):
+    if concedidas or revogadas:
+        st.success(f"Permissões atualizadas: {concedidas} concedida(s), {revogadas} revogada(s).")
+    else:
+        st.info("Nenhuma alteração.")
+
+
+# Função para definir as permissões de um usuário
+def cadastrar_permissao(df_usuarios, df_funcionalidades):
     # Título da página
     st.title("Cadastro de Permissões")
 
-    # Buscar usuários cadastrados
-    df_usuarios = conversa_banco.select("usuarios", {
-        "ID": "id", "Nome": "texto", "Email": "texto", "Senha": "texto"
-    })
+    usuarios_opcoes = rotulos_usuarios(df_usuarios)
+    funcs_opcoes = rotulos_funcionalidades(df_funcionalidades)
+    if not usuarios_opcoes or not funcs_opcoes:
+        st.warning("Cadastre usuários e funcionalidades primeiro.")
+        return
 
-    # Buscar funcionalidades cadastradas
-    df_funcionalidades = conversa_banco.select("funcionalidades", {
-        "ID": "id", "ID_Menu": "texto", "Nome": "texto", "Caminho": "texto"
-    })
+    usuario_id = st.selectbox("Selecione o Usuário", list(usuarios_opcoes), format_func=usuarios_opcoes.get)
 
-    # Criar o formulário para selecionar o usuário e as funcionalidades
-    with st.form("form_permissao"):
-        usuarios_opcoes = {row["Nome"]: row["ID"] for _, row in df_usuarios.iterrows()}
-        usuario_selecionado = st.selectbox("Selecione o Usuário", list(usuarios_opcoes.keys()))
+    # Pré-seleciona o que o usuário já tem
+    atuais = permissoes_atuais().get(usuario_id, frozenset())
+    marcadas = [r for r, i in funcs_opcoes.items() if i in atuais]
 
+    # Criar o formulário para marcar as funcionalidades liberadas
+    with st.form(f"form_permissao_{usuario_id}"):
         funcionalidades_selecionadas = st.multiselect(
-            "Selecione as Funcionalidades", 
-            options=[row["Nome"] for _, row in df_funcionalidades.iterrows()],
-            default=[]
+            "Funcionalidades liberadas",
+            options=list(funcs_opcoes.keys()),
+            default=marcadas,
         )
 
         # Botão de envio do formulário
-        enviar = st.form_submit_button("Cadastrar Permissões")
+        enviar = st.form_submit_button("Salvar Permissões")
 
         if enviar:
-            if not funcionalidades_selecionadas:
-                st.error("Selecione ao menos uma funcionalidade.")
-            else:
-                for func in funcionalidades_selecionadas:
-                    # Obter o ID da funcionalidade selecionada
-                    id_func = df_funcionalidades[df_funcionalidades["Nome"] == func]["ID"].values[0]
-                    
-                    # Verificar se o usuário já tem permissão para a funcionalidade
-                    permissoes_usuario = conversa_banco.select("permissoes", {
-                        "ID_Usuario": "texto", 
-                        "ID_Funcionalidade": "texto"
-                    })
-
-                    # Verificar se a permissão já foi atribuída
-                    permissao_existente = permissoes_usuario[
-                        (permissoes_usuario["ID_Usuario"] == usuarios_opcoes[usuario_selecionado]) & 
-                        (permissoes_usuario["ID_Funcionalidade"] == id_func)
-                    ]
-                    
-                    if permissao_existente.empty:
-                        # Inserir nova permissão
-                        dados_permissao = {
-                            "ID_Usuario": usuarios_opcoes[usuario_selecionado],
-                            "ID_Funcionalidade": id_func,
-                        }
-                        conversa_banco.insert("permissoes", dados_permissao)
-                        st.success(f"Permissão '{func}' cadastrada com sucesso para o usuário '{usuario_selecionado}'.")
-                    else:
-                        st.warning(f"O usuário '{usuario_selecionado}' já tem permissão para a funcionalidade '{func}'.")
+            desejadas = {funcs_opcoes[r] for r in funcionalidades_selecionadas}
+            avisar_resultado(*definir_permissoes({usuario_id: desejadas}))
+
+
+# Matriz usuário × funcionalidade (marca/desmarca várias de uma vez)
+def editar_matriz(df_usuarios, df_funcionalidades):
+    st.subheader("Matriz de Permissões")
+
+    # Linhas indexadas pelo ID do usuário; o nome é só uma coluna de rótulo
+    usuarios = dict(zip(df_usuarios["ID"].astype(str).str.strip(), df_usuarios["Nome"]))
+    funcs = rotulos_funcionalidades(df_funcionalidades)
+    if not usuarios or not funcs:
+        return
+
+    atuais = permissoes_atuais()
+    ids_funcs = list(funcs.values())
+    colunas = list(funcs.keys())
+    matriz = pd.DataFrame(
+        [[f in atuais.get(u, frozenset()) for f in ids_funcs] for u in usuarios],
+        index=pd.Index(list(usuarios), name="ID"),
+        columns=colunas,
+    )
+    matriz.insert(0, "Usuário", list(usuarios.values()))
+
+    with st.form("form_matriz_permissoes"):
+        editada = st.data_editor(
+            matriz,
+            use_container_width=True,
+            disabled=["Usuário"],
+            column_config={
+                "Usuário": st.column_config.TextColumn("Usuário"),
+                **{c: st.column_config.CheckboxColumn(c) for c in colunas},
+            },
+            key="matriz_permissoes",
+        )
+        salvar = st.form_submit_button("Salvar Matriz")
+
+    if salvar:
+        valores = editada[colunas].to_numpy(dtype=bool)
+        desejadas = {
+            u: {ids_funcs[j] for j in valores[i].nonzero()[0]}
+            for i, u in enumerate(editada.index)
+        }
+        avisar_resultado(*definir_permissoes(desejadas))
+
 
 # Exibir as permissões cadastradas
 def listar_permissoes():
     st.subheader("Permissões Cadastradas")
-    
+
     # Buscar as permissões na planilha
-    permissoes = conversa_banco.select("permissoes", {
-        "ID": "id",
-        "ID_Usuario": "texto",
-        "ID_Funcionalidade": "texto"
-    })
+    permissoes = conversa_banco.select(TABELA_PERMISSOES, TIPOS_PERMISSOES)
 
     # Exibe a lista de permissões
     st.dataframe(permissoes)
 
 # Função principal que organiza a página
 def app():
+    # Buscar usuários e funcionalidades cadastrados
+    df_usuarios = conversa_banco.select(TABELA_USUARIOS, TIPOS_USUARIOS)
+    df_funcionalidades = conversa_banco.select(TABELA_FUNCIONALIDADES, TIPOS_FUNCIONALIDADES)
+
     # Cadastro de permissões
-    cadastrar_permissao()
+    cadastrar_permissao(df_usuarios, df_funcionalidades)
+
+    # Matriz usuário × funcionalidade
+    editar_matriz(df_usuarios, df_funcionalidades)
 
     # Exibir as permissões cadastradas
     listar_permissoes()
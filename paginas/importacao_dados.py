@@ -0,0 +1,97 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from funcoes_compartilhadas import conversa_banco, importa_dados, indice_documentos
+from funcoes_compartilhadas.controle_acesso import (
+    TIPOS_USUARIOS, emails_cadastrados, normalizar_email_serie,
+)
+from paginas.cadastro_clientes import TIPOS_COLUNAS as TIPOS_CLIENTES
+
+# Tabelas que aceitam importação e seus tipos de colunas
+TABELAS = {
+    "clientes": TIPOS_CLIENTES,
+    # senha do arquivo vira hash na conversão (login compara com hash_senha)
+    "usuarios": {**TIPOS_USUARIOS, "Senha": "senha"},
+    "menus": {"ID": "id", "Nome": "texto", "Ordem": "numero100"},
+    "funcionalidades": {"ID": "id", "ID_Menu": "texto", "Nome": "texto", "Caminho": "texto"},
+    "permissoes": {"ID": "id", "ID_Usuario": "texto", "ID_Funcionalidade": "texto"},
+}
+
+
+# Valores para células vazias (avaliados uma vez por importação)
+PADROES = {
+    "clientes": {"Data do Cadastro": lambda: datetime.now().strftime("%d/%m/%Y %H:%M:%S")},
+}
+
+
+# Função para importar um arquivo para a tabela escolhida
+def importar_arquivo():
+    st.title("Importação de Dados")
+
+    tabela = st.selectbox("Tabela de destino", list(TABELAS.keys()))
+    tipos = TABELAS[tabela]
+    st.caption("Colunas esperadas: " + ", ".join(tipos.keys()))
+
+    arquivo = st.file_uploader("Arquivo CSV ou Excel", type=["csv", "xlsx"])
+    if not arquivo:
+        return
+
+    # Ponto de retomada do mesmo arquivo (se uma importação anterior falhou)
+    chave = f"importacao_{tabela}_{arquivo.name}_{arquivo.size}"
+    inicio = st.session_state.get(chave, 0)
+    if inicio:
+        st.info(f"Importação anterior parou na linha {inicio}. Clique em Importar para continuar dali.")
+        if st.button("Recomeçar do início"):
+            st.session_state.pop(chave, None)
+            st.rerun()
+
+    tamanho = int(st.number_input("Linhas por bloco", min_value=100, max_value=10000,
+                                  value=importa_dados.TAMANHO_BLOCO, step=100))
+
+    if st.button("📥 Importar"):
+        total = importa_dados.contar_linhas(arquivo, arquivo.name)
+        barra = st.progress(0.0, text="Importando...")
+
+        def progresso(lidas: int):
+            if total:
+                barra.progress(min(lidas / total, 1.0), text=f"{lidas} de {total} linhas")
+            else:
+                barra.progress(0.0, text=f"{lidas} linhas")
+
+        # Clientes: rejeita CPF que já existe (na tabela ou repetido no arquivo)
+        filtro = None
+        if tabela == "clientes":
+            docs = indice_documentos.indice(
+                conversa_banco.select(tabela, tipos), tabela, conversa_banco.versao(tabela)
+            )
+            filtro = indice_documentos.filtro_duplicados(docs)
+        # Usuários: rejeita Email que já existe (na tabela ou repetido no arquivo)
+        elif tabela == "usuarios":
+            filtro = indice_documentos.filtro_unicos(
+                emails_cadastrados(), "Email", normalizar_email_serie
+            )
+
+        resultado = importa_dados.importar(
+            tabela, arquivo, arquivo.name, tipos,
+            inicio=inicio, tamanho_bloco=tamanho, progresso=progresso, filtro=filtro,
+            padroes=PADROES.get(tabela),
+        )
+        barra.empty()
+
+        st.session_state[chave] = resultado["proxima_linha"]
+        if resultado["erro"]:
+            st.error(f"❌ Falha na linha {resultado['proxima_linha']}: {resultado['erro']}. "
+                     "Clique em Importar de novo para retomar.")
+        else:
+            st.session_state.pop(chave, None)
+            st.success(f"✅ {resultado['importadas']} registro(s) importado(s).")
+
+        rejeitadas: pd.DataFrame = resultado["rejeitadas"]
+        if not rejeitadas.empty:
+            st.warning(f"⚠️ {len(rejeitadas)} linha(s) rejeitada(s).")
+            st.dataframe(rejeitadas)
+
+
+# Função principal que organiza a página
+def app():
+    importar_arquivo()
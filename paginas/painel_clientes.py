@@ -0,0 +1,72 @@
+import streamlit as st
+import pandas as pd
+import altair as alt
+from funcoes_compartilhadas import conversa_banco, agregados
+from paginas.cadastro_clientes import TABELA, TIPOS_COLUNAS
+
+# Dimensões do painel (contagens guardadas por versão da tabela)
+DIMENSOES = {
+    "Convênio": agregados.por_coluna("Convênio"),
+    "Origem do Cliente": agregados.por_coluna("Origem do Cliente"),
+    "Cidade": agregados.por_coluna("Cidade"),
+    "Mês do Cadastro": agregados.por_mes("Data do Cadastro"),
+}
+
+# Quantas categorias mostrar nos gráficos de barras
+LIMITE_CATEGORIAS = 15
+
+
+# Gráfico de barras horizontais com as maiores categorias
+def grafico_barras(contagem: pd.Series, titulo: str):
+    dados = contagem.sort_values(ascending=False).head(LIMITE_CATEGORIAS)
+    dados = dados.rename_axis(titulo).reset_index(name="Clientes")
+    grafico = alt.Chart(dados).mark_bar().encode(
+        x=alt.X("Clientes:Q"),
+        y=alt.Y(f"{titulo}:N", sort="-x", title=None),
+        tooltip=[f"{titulo}:N", "Clientes:Q"],
+    )
+    st.altair_chart(grafico, use_container_width=True)
+
+
+# Gráfico de linha com os cadastros por mês
+def grafico_meses(contagem: pd.Series):
+    dados = contagem.drop(agregados.VAZIO, errors="ignore").sort_index()
+    dados = dados.rename_axis("Mês").reset_index(name="Clientes")
+    dados["Mês"] = dados["Mês"] + "-01"
+    grafico = alt.Chart(dados).mark_line(point=True).encode(
+        x=alt.X("Mês:T", timeUnit="yearmonth", title=None),
+        y=alt.Y("Clientes:Q"),
+        tooltip=[alt.Tooltip("Mês:T", timeUnit="yearmonth"), "Clientes:Q"],
+    )
+    st.altair_chart(grafico, use_container_width=True)
+
+
+# Função principal que organiza a página
+def app():
+    st.title("Painel de Clientes")
+
+    df = conversa_banco.select(TABELA, TIPOS_COLUNAS)
+    if df.empty:
+        st.info("Nenhum cliente cadastrado ainda.")
+        return
+
+    cont = agregados.contagens(df, TABELA, conversa_banco.versao(TABELA), DIMENSOES)
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Clientes", len(df))
+    col2.metric("Convênios", len(cont["Convênio"].drop(agregados.VAZIO, errors="ignore")))
+    col3.metric("Cidades", len(cont["Cidade"].drop(agregados.VAZIO, errors="ignore")))
+
+    st.subheader("Cadastros por mês")
+    grafico_meses(cont["Mês do Cadastro"])
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Por Convênio")
+        grafico_barras(cont["Convênio"], "Convênio")
+    with col2:
+        st.subheader("Por Origem do Cliente")
+        grafico_barras(cont["Origem do Cliente"], "Origem do Cliente")
+
+    st.subheader("Por Cidade")
+    grafico_barras(cont["Cidade"], "Cidade")